@@ -1 +1,27 @@
 """Common dependencies for API endpoints."""
+
+from asyncio import current_task
+
+from sqlalchemy.ext.asyncio import async_scoped_session
+
+from fastcore.db.engine import SessionLocal
+
+# Task-scoped session registry: every call within the same request task gets
+# the same AsyncSession, so endpoints that resolve several services share one
+# session (and one pooled connection) instead of opening one each.
+AsyncScopedSession = async_scoped_session(SessionLocal, scopefunc=current_task)
+
+
+async def get_scoped_db():
+    """
+    Yield the request-scoped database session.
+
+    Drop-in replacement for fastcore's get_db in modules whose endpoints
+    depend on more than one service; the scoped registry deduplicates the
+    sessions those dependencies would otherwise each create.
+    """
+    session = AsyncScopedSession()
+    try:
+        yield session
+    finally:
+        await AsyncScopedSession.remove()
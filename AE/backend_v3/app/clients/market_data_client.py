@@ -2,13 +2,21 @@ import concurrent.futures
 from datetime import datetime, timezone
 from typing import List
 
+import requests
 import yfinance as yf
+from requests.adapters import HTTPAdapter
+
 from fastcore.logging.manager import ensure_logger
 
 from app.modules.instruments.utils import map_market, map_quote_type
 
 logger = ensure_logger(None, __name__)
 
+# Shared pooled session for direct HTTP calls (TradingView scanner): reuses
+# keep-alive connections across calls instead of a fresh handshake each time.
+_http_session = requests.Session()
+_http_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
 
 class MarketDataClient:
     """
@@ -159,8 +167,6 @@ class MarketDataClient:
         Returns:
             List[str]: List of stock symbols that are components of the given index.
         """
-        import requests
-
         headers = {
             "accept": "application/json",
             "content-type": "text/plain;charset=UTF-8",
@@ -183,10 +189,11 @@ class MarketDataClient:
             # "preset": "index_components_market_pages",
         }
 
-        response = requests.post(
+        response = _http_session.post(
             "https://scanner.tradingview.com/global/scan?label-product=symbols-components",
             headers=headers,
             json=payload,
+            timeout=30,
         )
 
         response.raise_for_status()
@@ -36,7 +36,9 @@ async def create_instrument(
 )
 async def list_instruments_with_latest_price(
     service: InstrumentService = Depends(get_instrument_service),
-    page: int = Query(1, ge=1),
+    after_id: Optional[int] = Query(
+        None, ge=1, description="Cursor: id of the last instrument of the previous page"
+    ),
     page_size: int = Query(100, ge=1, le=1000),
     symbol: Optional[str] = Query(None),
     name: Optional[str] = Query(None),
@@ -50,6 +52,9 @@ async def list_instruments_with_latest_price(
 ) -> ListResponse[InstrumentWithLatestPriceResponse]:
     """
     List instruments with their latest price and price info.
+
+    Paginated by keyset: pass the id of the last returned instrument as
+    after_id to fetch the next page.
     """
     filters = {
         k: v
@@ -66,20 +71,18 @@ async def list_instruments_with_latest_price(
         }.items()
         if v is not None
     }
-    offset = (page - 1) * page_size
-    limit = page_size
 
-    instruments = await service.list_with_latest_price(
-        filters=filters, offset=offset, limit=limit
+    # total rides along as a window count, so no separate count() call;
+    # it reflects the rows matching the filters from the cursor onwards
+    instruments, total = await service.list_with_latest_price(
+        filters=filters, limit=page_size, after_id=after_id
     )
-    total = await service.count(filters=filters)
 
     metadata = ListMetadata(
         total=total,
-        page=page,
         page_size=page_size,
-        has_next=(page * page_size) < total,
-        has_previous=page > 1,
+        has_next=len(instruments) == page_size,
+        has_previous=after_id is not None,
     )
 
     return ListResponse(data=instruments, metadata=metadata)
@@ -140,8 +143,10 @@ async def list_instruments(
     offset = (page - 1) * page_size
     limit = page_size
 
-    instruments = await service.list(filters=filters, offset=offset, limit=limit)
-    total = await service.count(filters=filters)
+    # single round-trip: the page and the filtered total come back together
+    instruments, total = await service.list_with_total(
+        filters=filters, offset=offset, limit=limit
+    )
 
     metadata = ListMetadata(
         total=total,
@@ -5,29 +5,30 @@ Provides dependencies for InstrumentService and InstrumentPriceHistoryService.
 """
 
 from fastapi import Depends
-from fastcore.db.manager import get_db
+
+from app.api.dependencies import get_scoped_db
 
 from .service import InstrumentPriceHistoryService, InstrumentService
 
 
-def get_instrument_service(session=Depends(get_db)):
+def get_instrument_service(session=Depends(get_scoped_db)):
     """
     Dependency provider for InstrumentService.
 
     Args:
-        session: Database session provided by get_db.
+        session: Request-scoped database session provided by get_scoped_db.
     Returns:
         InstrumentService: Service instance for instrument operations.
     """
     return InstrumentService(session)
 
 
-def get_price_history_service(session=Depends(get_db)):
+def get_price_history_service(session=Depends(get_scoped_db)):
     """
     Dependency provider for InstrumentPriceHistoryService.
 
     Args:
-        session: Database session provided by get_db.
+        session: Request-scoped database session provided by get_scoped_db.
     Returns:
         InstrumentPriceHistoryService: Service instance for price history operations.
     """
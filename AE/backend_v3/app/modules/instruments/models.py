@@ -11,15 +11,17 @@ from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
-    Enum,
     ForeignKey,
     Index,
     Integer,
     Numeric,
+    SmallInteger,
     String,
     Table,
+    text,
 )
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 
 
 class InstrumentType(str, enum.Enum):
@@ -44,6 +46,38 @@ class MarketType(str, enum.Enum):
     OTHER = "other"
 
 
+class EnumSmallInteger(TypeDecorator):
+    """
+    Store a Python enum as a smallint code.
+
+    Avoids PostgreSQL ENUM types: adding a member needs no ALTER TYPE DDL,
+    and rows/indexes carry a 2-byte code instead of a 4-byte oid-referenced
+    value. Codes follow declaration order, so new members must only ever be
+    appended to the enum.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls):
+        super().__init__()
+        self.enum_cls = enum_cls
+        self._to_code = {member: code for code, member in enumerate(enum_cls)}
+        self._from_code = {code: member for code, member in enumerate(enum_cls)}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, self.enum_cls):
+            value = self.enum_cls(value)
+        return self._to_code[value]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._from_code[value]
+
+
 index_constituents = Table(
     "index_constituents",
     metadata,
@@ -82,12 +116,12 @@ class Instrument(BaseModel):
 
     symbol = Column(String(20), nullable=False, unique=True, index=True)
     name = Column(String(255), nullable=False)
-    type = Column(Enum(InstrumentType), nullable=False, index=True)
+    type = Column(EnumSmallInteger(InstrumentType), nullable=False, index=True)
     country = Column(String(2), nullable=True, index=True)
     currency = Column(String(3), nullable=False, default="USD")
     sector = Column(String(100), nullable=True)
     industry = Column(String(100), nullable=True)
-    market = Column(Enum(MarketType), nullable=False, index=True)
+    market = Column(EnumSmallInteger(MarketType), nullable=False, index=True)
     is_active = Column(Boolean, default=True, nullable=False)
 
     # Relationships
@@ -152,9 +186,13 @@ class InstrumentPriceHistory(BaseModel):
     # Relationships
     instrument = relationship("Instrument", back_populates="price_history")
 
-    # efficient index for time range queries
+    # efficient index for per-instrument latest-price and range queries
     __table_args__ = (
-        Index("idx_price_history_ts_instrument", "market_timestamp", "instrument_id"),
+        Index(
+            "idx_price_history_instrument_ts_desc",
+            "instrument_id",
+            text("market_timestamp DESC"),
+        ),
         {"comment": "Time-series price data for instruments"},
     )
 
@@ -4,14 +4,27 @@ Repository layer for the instruments module.
 Provides database access methods for instrument and price history operations.
 """
 
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from functools import wraps
+from operator import itemgetter
 from typing import Any, Callable, Optional, Sequence, TypeVar
 
 from fastcore.db import BaseRepository
 from fastcore.errors.exceptions import DBError, NotFoundError
 from fastcore.logging.manager import ensure_logger
-from sqlalchemy import and_, delete, desc, func, select
+from sqlalchemy import (
+    and_,
+    bindparam,
+    delete,
+    desc,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import aliased
 
@@ -48,6 +61,110 @@ def db_error_handler(func: Callable[..., R]) -> Callable[..., R]:
     return wrapper
 
 
+@contextmanager
+def db_error_scope(method_name: str):
+    """
+    Context-manager variant of db_error_handler for hot repository methods.
+    Avoids the extra wrapper coroutine the decorator allocates per call;
+    the method body is wrapped in a single try/except instead.
+    Args:
+        method_name (str): Name used in the error log on failure.
+    """
+    try:
+        yield
+    except NotFoundError:
+        # Do not log as error, just re-raise
+        raise
+    except Exception as e:
+        logger.error(f"Error in {method_name}: {e}")
+        raise DBError(message=str(e))
+
+
+# Hot-path statements built once at import with bound parameters. Per call,
+# only the parameters are bound and SQLAlchemy serves the compiled SQL from
+# its cache keyed on these stable objects; driver-level prepared-statement
+# caching (asyncpg statement_cache_size) is configured with the engine in
+# fastcore.
+_GET_BY_SYMBOL_STMT = select(Instrument).where(
+    Instrument.symbol == bindparam("symbol")
+)
+_GET_LATEST_PRICE_STMT = (
+    select(InstrumentPriceHistory)
+    .where(InstrumentPriceHistory.instrument_id == bindparam("instrument_id"))
+    .order_by(desc(InstrumentPriceHistory.market_timestamp))
+    .limit(1)
+)
+_GET_PRICES_IN_RANGE_STMT = (
+    select(InstrumentPriceHistory)
+    .where(
+        and_(
+            InstrumentPriceHistory.instrument_id == bindparam("instrument_id"),
+            InstrumentPriceHistory.market_timestamp >= bindparam("start"),
+            InstrumentPriceHistory.market_timestamp <= bindparam("end"),
+        )
+    )
+    .order_by(InstrumentPriceHistory.market_timestamp)
+)
+
+
+# Columnar upsert for price history: one array bind per column via unnest()
+# instead of one placeholder set per row, so asyncpg ships each column as a
+# single binary array. created_at/updated_at have no server default, hence the
+# explicit now().
+_PRICE_HISTORY_UNNEST_UPSERT = text(
+    """
+    INSERT INTO instrument_price_history (
+        instrument_id, market_timestamp, price, change, change_percent,
+        volume, day_high, day_low, w52_high, w52_low, previous_close,
+        created_at, updated_at
+    )
+    SELECT u.*, now(), now()
+    FROM unnest(
+        CAST(:instrument_ids AS int[]),
+        CAST(:market_timestamps AS timestamptz[]),
+        CAST(:prices AS numeric[]),
+        CAST(:changes AS numeric[]),
+        CAST(:change_percents AS numeric[]),
+        CAST(:volumes AS numeric[]),
+        CAST(:day_highs AS numeric[]),
+        CAST(:day_lows AS numeric[]),
+        CAST(:w52_highs AS numeric[]),
+        CAST(:w52_lows AS numeric[]),
+        CAST(:previous_closes AS numeric[])
+    ) AS u(
+        instrument_id, market_timestamp, price, change, change_percent,
+        volume, day_high, day_low, w52_high, w52_low, previous_close
+    )
+    ON CONFLICT (instrument_id, market_timestamp) DO UPDATE SET
+        price = EXCLUDED.price,
+        change = EXCLUDED.change,
+        change_percent = EXCLUDED.change_percent,
+        volume = EXCLUDED.volume,
+        day_high = EXCLUDED.day_high,
+        day_low = EXCLUDED.day_low,
+        w52_high = EXCLUDED.w52_high,
+        w52_low = EXCLUDED.w52_low,
+        previous_close = EXCLUDED.previous_close,
+        updated_at = now()
+    """
+)
+
+# (record-key, bind-param) pairs for the unnest upsert, in column order
+_UNNEST_UPSERT_PARAMS = (
+    ("instrument_id", "instrument_ids"),
+    ("market_timestamp", "market_timestamps"),
+    ("price", "prices"),
+    ("change", "changes"),
+    ("change_percent", "change_percents"),
+    ("volume", "volumes"),
+    ("day_high", "day_highs"),
+    ("day_low", "day_lows"),
+    ("w52_high", "w52_highs"),
+    ("w52_low", "w52_lows"),
+    ("previous_close", "previous_closes"),
+)
+
+
 class InstrumentRepository(BaseRepository[Instrument]):
     """
     Repository for instrument-related database operations.
@@ -57,6 +174,74 @@ class InstrumentRepository(BaseRepository[Instrument]):
         super().__init__(Instrument, session)
 
     @db_error_handler
+    async def create(self, data: dict) -> Optional[Instrument]:
+        """
+        Create an Instrument with INSERT ... ON CONFLICT DO NOTHING RETURNING.
+        Hydrates the new row from the write result, so the service does not
+        need a refresh round-trip after commit. The conflict clause folds the
+        duplicate-symbol check into the insert itself, closing the
+        check-then-insert race.
+        Args:
+            data (dict): Column values for the new instrument.
+        Returns:
+            Optional[Instrument]: The created Instrument, or None if an
+                instrument with the same symbol already exists.
+        """
+        stmt = (
+            pg_insert(self.model)
+            .values(**data)
+            .on_conflict_do_nothing(index_elements=["symbol"])
+            .returning(self.model)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @db_error_handler
+    async def update(self, instrument_id: int, data: dict) -> Optional[Instrument]:
+        """
+        Update an Instrument with a single UPDATE ... RETURNING.
+        Combines the existence check and the write: a missing id simply
+        returns None instead of costing a prior SELECT.
+        Args:
+            instrument_id (int): The ID of the instrument.
+            data (dict): Fields to update.
+        Returns:
+            Optional[Instrument]: The updated Instrument, or None if the id
+                does not exist.
+        """
+        if not data:
+            return await self.get_by_id(instrument_id)
+
+        stmt = (
+            update(self.model)
+            .where(self.model.id == instrument_id)
+            .values(**data)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @db_error_handler
+    async def delete(self, instrument_id: int) -> Optional[str]:
+        """
+        Delete an Instrument and report its symbol in the same round-trip.
+        The symbol lets the service invalidate the per-entity cache keys
+        without a lookup before the delete.
+        Args:
+            instrument_id (int): The ID of the instrument.
+        Returns:
+            Optional[str]: The deleted instrument's symbol, or None if the id
+                did not exist.
+        """
+        stmt = (
+            delete(self.model)
+            .where(self.model.id == instrument_id)
+            .returning(self.model.symbol)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def get_by_symbol(self, symbol: str) -> Optional[Instrument]:
         """
         Get Instrument by symbol.
@@ -65,11 +250,32 @@ class InstrumentRepository(BaseRepository[Instrument]):
         Returns:
             Optional[Instrument]: The Instrument object if found, else None.
         """
-        stmt = select(self.model).where(self.model.symbol == symbol)
-        result = await self.session.execute(stmt)
-        return result.scalars().first()
+        with db_error_scope("get_by_symbol"):
+            result = await self.session.execute(
+                _GET_BY_SYMBOL_STMT, {"symbol": symbol}
+            )
+            return result.scalars().first()
+
+    async def get_by_symbols(self, symbols: list[str]) -> dict[str, Instrument]:
+        """
+        Get multiple Instruments by symbol in one round-trip.
+        Args:
+            symbols (list[str]): The symbols to look up.
+        Returns:
+            dict[str, Instrument]: Mapping of symbol to Instrument for the
+            symbols that exist; missing symbols are simply absent.
+        """
+        if not symbols:
+            return {}
+        with db_error_scope("get_by_symbols"):
+            result = await self.session.execute(
+                select(self.model).where(self.model.symbol.in_(symbols))
+            )
+            return {
+                instrument.symbol: instrument
+                for instrument in result.scalars().all()
+            }
 
-    @db_error_handler
     async def bulk_insert(self, records: list[dict]) -> list[Instrument]:
         """
         Efficiently insert multiple Instrument records in bulk using SQLAlchemy core insert.
@@ -78,17 +284,25 @@ class InstrumentRepository(BaseRepository[Instrument]):
         Returns:
             None
         """
-        # stmt = insert(self.model)
-        stmt = pg_insert(self.model).on_conflict_do_nothing(index_elements=["symbol"])
-        await self.session.execute(stmt, records)
-
-        # Fetch and return the inserted records by symbol
-        symbols = [r["symbol"] for r in records]
-        stmt = select(self.model).where(self.model.symbol.in_(symbols))
-        result = await self.session.execute(stmt)
-        return result.scalars().all()
+        with db_error_scope("bulk_insert"):
+            # stmt = insert(self.model)
+            stmt = pg_insert(self.model).on_conflict_do_nothing(
+                index_elements=["symbol"]
+            )
+            await self.session.execute(stmt, records)
+
+            # Fetch and return the records by symbol. RETURNING would skip the
+            # rows the conflict clause ignored, so the re-SELECT stays; mark it
+            # populate_existing so identity-map instances are refreshed.
+            symbols = [r["symbol"] for r in records]
+            stmt = (
+                select(self.model)
+                .where(self.model.symbol.in_(symbols))
+                .execution_options(populate_existing=True)
+            )
+            result = await self.session.execute(stmt)
+            return result.scalars().all()
 
-    @db_error_handler
     async def bulk_upsert(self, records: list[dict]) -> list[Instrument]:
         """
         Efficiently insert or update multiple Instrument records in bulk using PostgreSQL upsert (ON CONFLICT DO UPDATE).
@@ -97,28 +311,137 @@ class InstrumentRepository(BaseRepository[Instrument]):
         Returns:
             None
         """
-        stmt = pg_insert(self.model)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["symbol"],
-            set_={
-                "name": stmt.excluded.name,
-                "type": stmt.excluded.type,
-                "country": stmt.excluded.country,
-                "currency": stmt.excluded.currency,
-                "sector": stmt.excluded.sector,
-                "industry": stmt.excluded.industry,
-                "market": stmt.excluded.market,
-                "is_active": stmt.excluded.is_active,
-                "updated_at": datetime.now(timezone.utc),
-            },
-        )
-        await self.session.execute(stmt, records)
+        with db_error_scope("bulk_upsert"):
+            stmt = pg_insert(self.model)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["symbol"],
+                set_={
+                    "name": stmt.excluded.name,
+                    "type": stmt.excluded.type,
+                    "country": stmt.excluded.country,
+                    "currency": stmt.excluded.currency,
+                    "sector": stmt.excluded.sector,
+                    "industry": stmt.excluded.industry,
+                    "market": stmt.excluded.market,
+                    "is_active": stmt.excluded.is_active,
+                    "updated_at": func.now(),
+                },
+            )
+            # DO UPDATE touches every conflicting row, so RETURNING yields all
+            # upserted records in one round-trip; populate_existing refreshes
+            # any stale instances already in the identity map.
+            stmt = stmt.returning(self.model).execution_options(
+                populate_existing=True
+            )
+            result = await self.session.execute(stmt, records)
+            return result.scalars().all()
+
+    async def upsert_index_constituents(
+        self, index_id: int, records: list[dict]
+    ) -> None:
+        """
+        Upsert Instrument records and link them to an index in one statement.
+        The upsert runs as a data-modifying CTE whose RETURNING ids feed the
+        index_constituents insert, so membership stays consistent with the
+        upsert atomically and without a second round-trip.
+        Args:
+            index_id (int): The ID of the index instrument.
+            records (list[dict]): List of dicts representing Instrument records.
+        Returns:
+            None
+        """
+        with db_error_scope("upsert_index_constituents"):
+            stmt = pg_insert(self.model).values(records)
+            ups = stmt.on_conflict_do_update(
+                index_elements=["symbol"],
+                set_={
+                    "name": stmt.excluded.name,
+                    "type": stmt.excluded.type,
+                    "country": stmt.excluded.country,
+                    "currency": stmt.excluded.currency,
+                    "sector": stmt.excluded.sector,
+                    "industry": stmt.excluded.industry,
+                    "market": stmt.excluded.market,
+                    "is_active": stmt.excluded.is_active,
+                    "updated_at": func.now(),
+                },
+            ).returning(self.model.id).cte("ups")
+
+            link = (
+                pg_insert(index_constituents)
+                .from_select(
+                    ["index_id", "stock_id"],
+                    select(literal(index_id), ups.c.id),
+                )
+                .on_conflict_do_nothing()
+            )
+            await self.session.execute(link)
+
+    @db_error_handler
+    async def list_with_total(
+        self, filters: dict = None, offset: int = 0, limit: int = 100
+    ) -> tuple:
+        """
+        List instruments and the total matching count in one query.
+        A count(*) OVER () window column rides along with the page, replacing
+        the separate count() round-trip paginated endpoints used to issue.
+        Args:
+            filters (dict): Filters to apply on the instrument query.
+            offset (int): Pagination offset.
+            limit (int): Pagination limit.
+        Returns:
+            tuple[list[Instrument], int]: The page of instruments and the
+                total number of rows matching the filters.
+        """
+        stmt = select(self.model, func.count().over().label("total_count"))
+        if filters:
+            for k, v in filters.items():
+                if hasattr(self.model, k):
+                    stmt = stmt.where(getattr(self.model, k) == v)
+        stmt = stmt.order_by(self.model.id).offset(offset).limit(limit)
 
-        # Fetch and return the upserted records by symbol
-        symbols = [r["symbol"] for r in records]
-        stmt = select(self.model).where(self.model.symbol.in_(symbols))
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        rows = result.all()
+        if not rows:
+            # Page past the end: the window column is absent, fall back to
+            # a plain count so the total stays accurate
+            return [], await self.count(filters=filters)
+        return [row[0] for row in rows], rows[0].total_count
+
+    async def stream_list(
+        self,
+        filters: dict = None,
+        offset: int = 0,
+        limit: int = 100,
+        batch_size: int = 256,
+    ):
+        """
+        Stream instruments matching the filters from a server-side cursor.
+        Generator variant of list: rows are yielded as they arrive, so memory
+        stays bounded by batch_size instead of the full page.
+        Args:
+            filters (dict): Filters to apply on the instrument query.
+            offset (int): Pagination offset.
+            limit (int): Pagination limit.
+            batch_size (int): Number of rows fetched from the cursor at a time.
+        Yields:
+            Instrument: Matching instruments in id order.
+        """
+        stmt = select(self.model)
+        if filters:
+            for k, v in filters.items():
+                if hasattr(self.model, k):
+                    stmt = stmt.where(getattr(self.model, k) == v)
+        stmt = (
+            stmt.order_by(self.model.id)
+            .offset(offset)
+            .limit(limit)
+            .execution_options(yield_per=batch_size)
+        )
+        with db_error_scope("stream_list"):
+            result = await self.session.stream(stmt)
+            async for instrument in result.scalars():
+                yield instrument
 
     @db_error_handler
     async def add_stocks_to_index(self, index_id: int, stock_ids: list[int]) -> None:
@@ -235,16 +558,19 @@ class InstrumentRepository(BaseRepository[Instrument]):
 
     @db_error_handler
     async def list_with_latest_price(
-        self, filters: dict = None, limit: int = 100, offset: int = 0
+        self, filters: dict = None, limit: int = 100, after_id: Optional[int] = None
     ) -> list[tuple]:
         """
-        List instruments with their latest price.
+        List instruments with their latest price using keyset pagination.
         Args:
             filters (dict): Filters to apply on the instrument query.
             limit (int): Number of records to fetch.
-            offset (int): Offset for pagination.
+            after_id (Optional[int]): Fetch instruments with id greater than this
+                cursor (the last id of the previous page). None for the first page.
         Returns:
-            list[tuple]: List of tuples containing Instrument and its latest price.
+            tuple[list, int]: Rows of (Instrument, latest price columns) and
+                the total row count matching the filters and cursor, taken
+                from a count(*) OVER () window column.
         """
         # Subquery to get latest price per instrument
         subq = (
@@ -272,6 +598,7 @@ class InstrumentRepository(BaseRepository[Instrument]):
                 price_alias.w52_high,
                 price_alias.w52_low,
                 price_alias.previous_close,
+                func.count().over().label("total_count"),
             )
             .outerjoin(subq, Instrument.id == subq.c.instrument_id)
             .outerjoin(
@@ -287,11 +614,19 @@ class InstrumentRepository(BaseRepository[Instrument]):
                 if hasattr(Instrument, k):
                     stmt = stmt.where(getattr(Instrument, k) == v)
 
-        stmt = stmt.offset(offset).limit(limit)
+        # Keyset pagination: seek past the cursor instead of scanning and
+        # discarding `offset` rows, so deep pages stay O(limit)
+        if after_id is not None:
+            stmt = stmt.where(Instrument.id > after_id)
+
+        stmt = stmt.order_by(Instrument.id).limit(limit)
 
         result = await self.session.execute(stmt)
-        # Each row: (Instrument, price_alias)
-        return result.all()
+        # Each row: (Instrument, price columns..., total_count)
+        rows = result.all()
+        if not rows:
+            return [], 0
+        return rows, rows[0].total_count
 
 
 class InstrumentPriceHistoryRepository(BaseRepository[InstrumentPriceHistory]):
@@ -302,6 +637,44 @@ class InstrumentPriceHistoryRepository(BaseRepository[InstrumentPriceHistory]):
     def __init__(self, session):
         super().__init__(InstrumentPriceHistory, session)
 
+    @db_error_handler
+    async def create(self, data: dict) -> InstrumentPriceHistory:
+        """
+        Create a price history record with INSERT ... RETURNING.
+        Hydrates the new row from the write result, so the service does not
+        need a refresh round-trip after commit.
+        Args:
+            data (dict): Column values for the new record.
+        Returns:
+            InstrumentPriceHistory: The created record.
+        """
+        stmt = insert(self.model).values(**data).returning(self.model)
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
+    @db_error_handler
+    async def insert_if_absent(self, data: dict) -> bool:
+        """
+        Insert a price history record unless its key already exists.
+        Relies on the (instrument_id, market_timestamp) primary key via
+        ON CONFLICT DO NOTHING, so existence check and insert are one
+        statement.
+        Args:
+            data (dict): Column values for the new record.
+        Returns:
+            bool: True if a new row was inserted, False if it already existed.
+        """
+        stmt = (
+            pg_insert(self.model)
+            .values(**data)
+            .on_conflict_do_nothing(
+                index_elements=["instrument_id", "market_timestamp"]
+            )
+            .returning(self.model.instrument_id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
     # ===========================================================================================================
 
     # InstrumentPriceHistory has a composite primary key (instrument_id, market_timestamp)
@@ -356,12 +729,28 @@ class InstrumentPriceHistoryRepository(BaseRepository[InstrumentPriceHistory]):
         Raises:
             NotFoundError: If the record with the specified keys doesn't exist.
         """
-        record = await self.get_by_id(instrument_id, market_timestamp)
+        if not data:
+            return await self.get_by_id(instrument_id, market_timestamp)
 
-        for key, value in data.items():
-            setattr(record, key, value)
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.instrument_id == instrument_id,
+                self.model.market_timestamp == market_timestamp,
+            )
+            .values(**data)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        record = result.scalar_one_or_none()
+
+        if record is None:
+            raise NotFoundError(
+                resource_type=self.model.__name__,
+                resource_id=f"instrument_id={instrument_id}, timestamp={market_timestamp}",
+            )
 
-        await self.session.flush()
         return record
 
     @db_error_handler
@@ -385,7 +774,6 @@ class InstrumentPriceHistoryRepository(BaseRepository[InstrumentPriceHistory]):
 
     # ===========================================================================================================
 
-    @db_error_handler
     async def get_latest_price(
         self, instrument_id: int
     ) -> Optional[InstrumentPriceHistory]:
@@ -396,14 +784,38 @@ class InstrumentPriceHistoryRepository(BaseRepository[InstrumentPriceHistory]):
         Returns:
             Optional[InstrumentPriceHistory]: The latest InstrumentPriceHistory object if found, else None.
         """
-        stmt = (
-            select(self.model)
-            .where(self.model.instrument_id == instrument_id)
-            .order_by(desc(self.model.market_timestamp))
-            .limit(1)
-        )
-        result = await self.session.execute(stmt)
-        return result.scalars().first()
+        with db_error_scope("get_latest_price"):
+            result = await self.session.execute(
+                _GET_LATEST_PRICE_STMT, {"instrument_id": instrument_id}
+            )
+            return result.scalars().first()
+
+    async def get_latest_prices(
+        self, instrument_ids: list[int]
+    ) -> dict[int, InstrumentPriceHistory]:
+        """
+        Get the latest price for many instruments in a single query.
+        Uses PostgreSQL DISTINCT ON to pick the newest row per instrument,
+        avoiding the N+1 pattern of calling get_latest_price in a loop.
+        Args:
+            instrument_ids (list[int]): IDs of the instruments.
+        Returns:
+            dict[int, InstrumentPriceHistory]: Latest record keyed by
+                instrument_id; instruments without prices are absent.
+        """
+        with db_error_scope("get_latest_prices"):
+            if not instrument_ids:
+                return {}
+            stmt = (
+                select(self.model)
+                .where(self.model.instrument_id.in_(instrument_ids))
+                .order_by(
+                    self.model.instrument_id, desc(self.model.market_timestamp)
+                )
+                .distinct(self.model.instrument_id)
+            )
+            result = await self.session.execute(stmt)
+            return {r.instrument_id: r for r in result.scalars()}
 
     @db_error_handler
     async def get_prices_in_range(
@@ -418,6 +830,31 @@ class InstrumentPriceHistoryRepository(BaseRepository[InstrumentPriceHistory]):
         Returns:
             Sequence[InstrumentPriceHistory]: List of InstrumentPriceHistory objects within the date range.
         """
+        result = await self.session.execute(
+            _GET_PRICES_IN_RANGE_STMT,
+            {"instrument_id": instrument_id, "start": start, "end": end},
+        )
+        return result.scalars().all()
+
+    async def stream_prices_in_range(
+        self,
+        instrument_id: int,
+        start: datetime,
+        end: datetime,
+        batch_size: int = 5000,
+    ):
+        """
+        Stream price history records for a given instrument within a date range.
+        Uses a server-side cursor so memory stays bounded by batch_size instead
+        of the full result set.
+        Args:
+            instrument_id (int): The ID of the instrument.
+            start (datetime): Start date for the range.
+            end (datetime): End date for the range.
+            batch_size (int): Number of rows fetched from the cursor at a time.
+        Yields:
+            InstrumentPriceHistory: Price history records in timestamp order.
+        """
         stmt = (
             select(self.model)
             .where(
@@ -428,11 +865,14 @@ class InstrumentPriceHistoryRepository(BaseRepository[InstrumentPriceHistory]):
                 )
             )
             .order_by(self.model.market_timestamp)
+            .execution_options(yield_per=batch_size)
         )
-        result = await self.session.execute(stmt)
-        return result.scalars().all()
+        # db_error_handler only wraps coroutines, so scope errors inline here
+        with db_error_scope("stream_prices_in_range"):
+            result = await self.session.stream(stmt)
+            async for record in result.scalars():
+                yield record
 
-    @db_error_handler
     async def bulk_insert(self, records: list[dict]) -> None:
         """
         Efficiently insert multiple InstrumentPriceHistory records in bulk using SQLAlchemy core insert.
@@ -441,14 +881,42 @@ class InstrumentPriceHistoryRepository(BaseRepository[InstrumentPriceHistory]):
         Returns:
             None
         """
-        # stmt = insert(self.model)
-        stmt = pg_insert(self.model).on_conflict_do_nothing(
-            index_elements=["instrument_id", "market_timestamp"]
-        )
+        with db_error_scope("bulk_insert"):
+            # stmt = insert(self.model)
+            stmt = pg_insert(self.model).on_conflict_do_nothing(
+                index_elements=["instrument_id", "market_timestamp"]
+            )
 
-        await self.session.execute(stmt, records)
+            await self.session.execute(stmt, records)
+
+    async def copy_insert(self, records: list[dict]) -> None:
+        """
+        Load price history records with Postgres COPY via the raw asyncpg connection.
+        COPY is the fastest ingest path (several times quicker than INSERT)
+        but has no conflict handling, so records must not collide with
+        existing (instrument_id, market_timestamp) keys — intended for the
+        backfill jobs, which load fresh ranges.
+        Args:
+            records (list[dict]): List of dicts representing InstrumentPriceHistory records.
+        Returns:
+            None
+        """
+        with db_error_scope("copy_insert"):
+            now = datetime.now(timezone.utc)
+            columns = [key for key, _ in _UNNEST_UPSERT_PARAMS] + [
+                "created_at",
+                "updated_at",
+            ]
+            rows = [
+                tuple(r[key] for key, _ in _UNNEST_UPSERT_PARAMS) + (now, now)
+                for r in records
+            ]
+            conn = await self.session.connection()
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                "instrument_price_history", records=rows, columns=columns
+            )
 
-    @db_error_handler
     async def bulk_upsert(self, records: list[dict]) -> None:
         """
         Efficiently insert or update multiple InstrumentPriceHistory records in bulk using PostgreSQL upsert (ON CONFLICT DO UPDATE).
@@ -457,20 +925,9 @@ class InstrumentPriceHistoryRepository(BaseRepository[InstrumentPriceHistory]):
         Returns:
             None
         """
-        stmt = pg_insert(self.model)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["instrument_id", "market_timestamp"],
-            set_={
-                "price": stmt.excluded.price,
-                "change": stmt.excluded.change,
-                "change_percent": stmt.excluded.change_percent,
-                "volume": stmt.excluded.volume,
-                "day_high": stmt.excluded.day_high,
-                "day_low": stmt.excluded.day_low,
-                "previous_close": stmt.excluded.previous_close,
-                "w52_high": stmt.excluded.w52_high,
-                "w52_low": stmt.excluded.w52_low,
-                "updated_at": datetime.now(timezone.utc),
-            },
-        )
-        await self.session.execute(stmt, records)
+        with db_error_scope("bulk_upsert"):
+            params = {
+                bind: list(map(itemgetter(key), records))
+                for key, bind in _UNNEST_UPSERT_PARAMS
+            }
+            await self.session.execute(_PRICE_HISTORY_UNNEST_UPSERT, params)
@@ -6,6 +6,11 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from .models import InstrumentType, MarketType
 
+# Quantization templates, built once; quantize_data reuses them per field
+# instead of constructing a fresh Decimal per call.
+_Q6 = Decimal("0.000001")
+_Q4 = Decimal("0.0001")
+
 
 # --- Instrument Schemas ---
 class InstrumentBase(BaseModel):
@@ -40,7 +45,10 @@ class InstrumentResponse(InstrumentBase):
     id: int
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
-    model_config = ConfigDict(from_attributes=True)
+    # frozen skips __init__ bookkeeping for mutation support and lets
+    # pydantic's Rust core take faster construction/serialization paths;
+    # responses are write-once by nature
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 
 class InstrumentWithLatestPriceResponse(InstrumentResponse):
@@ -54,7 +62,7 @@ class InstrumentWithLatestPriceResponse(InstrumentResponse):
     w52_high: Optional[Decimal] = None
     w52_low: Optional[Decimal] = None
     previous_close: Optional[Decimal] = None
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 
 # --- Price History Schemas ---
@@ -76,21 +84,23 @@ class InstrumentPriceHistoryBase(BaseModel):
 
     @staticmethod
     def quantize_data(data: dict) -> dict:
-        def q(val, places):
+        def q(val, template):
             if val is None:
                 return None
-            return Decimal(str(val)).quantize(Decimal(places), rounding=ROUND_HALF_UP)
+            if not isinstance(val, Decimal):
+                val = Decimal(str(val))
+            return val.quantize(template, rounding=ROUND_HALF_UP)
 
         return {
             **data,
-            "price": q(data.get("price"), "0.000001"),
-            "change": q(data.get("change"), "0.000001"),
-            "change_percent": q(data.get("change_percent"), "0.0001"),
-            "day_high": q(data.get("day_high"), "0.000001"),
-            "day_low": q(data.get("day_low"), "0.000001"),
-            "w52_high": q(data.get("w52_high"), "0.000001"),
-            "w52_low": q(data.get("w52_low"), "0.000001"),
-            "previous_close": q(data.get("previous_close"), "0.000001"),
+            "price": q(data.get("price"), _Q6),
+            "change": q(data.get("change"), _Q6),
+            "change_percent": q(data.get("change_percent"), _Q4),
+            "day_high": q(data.get("day_high"), _Q6),
+            "day_low": q(data.get("day_low"), _Q6),
+            "w52_high": q(data.get("w52_high"), _Q6),
+            "w52_low": q(data.get("w52_low"), _Q6),
+            "previous_close": q(data.get("previous_close"), _Q6),
         }
 
     @classmethod
@@ -121,4 +131,4 @@ class InstrumentPriceHistoryResponse(InstrumentPriceHistoryBase):
     instrument_id: int
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
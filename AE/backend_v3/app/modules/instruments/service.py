@@ -3,7 +3,10 @@ Service layer for the instruments module.
 
 Handles business logic and transaction management for instruments and price history.
 """
+import asyncio
+from contextvars import ContextVar
 from datetime import datetime
+from functools import lru_cache, wraps
 from typing import List, Optional
 
 from fastcore.cache import cache
@@ -23,6 +26,162 @@ from .schemas import (
 )
 
 
+_cache_client_cv: ContextVar[Optional[object]] = ContextVar(
+    "instruments_cache_client", default=None
+)
+
+
+async def _get_cache():
+    """
+    Request-scoped memoized get_cache().
+
+    Endpoints often touch the cache several times per request; the contextvar
+    keeps the resolved client for the current task so only the first call
+    pays the fastcore lookup.
+    """
+    client = _cache_client_cv.get()
+    if client is None:
+        client = await get_cache()
+        _cache_client_cv.set(client)
+    return client
+
+
+def _chunked(items: list, size: int):
+    """Yield fixed-size slices of items for chunked bulk statements."""
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+# Bound Rust-level serializers for the bulk ingestion paths; calling them
+# directly skips the Python-side model_dump dispatch per record.
+_dump_instrument = InstrumentCreate.__pydantic_serializer__.to_python
+_dump_price_history = InstrumentPriceHistoryCreate.__pydantic_serializer__.to_python
+
+
+@lru_cache(maxsize=None)
+def _response_fields(schema_cls) -> tuple:
+    """Cached tuple of field names for a response schema class."""
+    return tuple(schema_cls.model_fields)
+
+
+def versioned_cache(ttl: int, prefix: str, schema_cls=None, with_total=False):
+    """
+    Generation-aware read cache for broad prefixes.
+
+    fastcore's @cache invalidates via clear(prefix), which scans the keyspace
+    for matching keys on every mutation. Here the cache key embeds a per-prefix
+    generation counter, so invalidation becomes a single increment of
+    "<prefix>gen"; superseded entries age out through their TTL. Lives in app
+    code because fastcore's decorator owns its own key format.
+
+    Args:
+        ttl (int): Cache TTL in seconds.
+        prefix (str): Key prefix, also used for the generation counter.
+        schema_cls: Response schema for rebuilding cached list payloads;
+            None caches the raw (JSON-safe) return value.
+        with_total (bool): Set when the method returns an (items, total)
+            tuple, as the fused list+count queries do.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            cache_client = await _get_cache()
+            gen = await cache_client.get(prefix + "gen") or 0
+            key = (
+                f"{prefix}gen{gen}:{func.__name__}:"
+                f"{args!r}:{sorted(kwargs.items())!r}"
+            )
+            cached = await cache_client.get(key)
+            if cached is not None:
+                if schema_cls is None:
+                    return cached
+                if with_total:
+                    items, total = cached
+                    return [schema_cls.model_validate(d) for d in items], total
+                return [schema_cls.model_validate(d) for d in cached]
+            result = await func(self, *args, **kwargs)
+            if schema_cls is None:
+                payload = result
+            elif with_total:
+                items, total = result
+                payload = ([r.model_dump(mode="json") for r in items], total)
+            else:
+                payload = [r.model_dump(mode="json") for r in result]
+            await cache_client.set(key, payload, ttl)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+# Strong references to in-flight background invalidations; asyncio only keeps
+# weak refs to tasks, so without this a pending invalidation could be
+# garbage-collected mid-flight.
+_background_invalidations: set = set()
+
+
+def _invalidate_in_background(coro) -> None:
+    """
+    Schedule a cache-invalidation coroutine without blocking the response.
+
+    Invalidation is best-effort — staleness is bounded by the entries' TTLs —
+    so the write path does not need to wait on the cache round-trips.
+    """
+    task = asyncio.create_task(coro)
+    _background_invalidations.add(task)
+    task.add_done_callback(_background_invalidations.discard)
+
+
+async def _bump_generation(cache_client, *prefixes: str) -> None:
+    """Invalidate versioned_cache prefixes with one increment per prefix."""
+    await asyncio.gather(
+        *(cache_client.increment(prefix + "gen") for prefix in prefixes)
+    )
+
+
+async def _invalidate(cache_client, *prefixes: str) -> None:
+    """
+    Clear several cache prefixes in one batch.
+
+    The sequential awaits this replaces paid one Redis round-trip per
+    prefix; dispatching the clears concurrently overlaps those RTTs. A true
+    single-round-trip pipeline needs support in fastcore's cache client.
+    """
+    await asyncio.gather(*(cache_client.clear(prefix) for prefix in prefixes))
+
+
+# Price columns selected after the Instrument entity in
+# InstrumentRepository.list_with_latest_price, in row order.
+_PRICE_ROW_FIELDS = (
+    "price",
+    "market_timestamp",
+    "change",
+    "change_percent",
+    "volume",
+    "day_high",
+    "day_low",
+    "w52_high",
+    "w52_low",
+    "previous_close",
+)
+_construct_with_price = InstrumentWithLatestPriceResponse.model_construct
+
+
+def _fast_from_orm(schema_cls, obj):
+    """
+    Build a response schema from a trusted ORM row without validation.
+
+    model_validate re-runs every validator per row, which dominates CPU on
+    list endpoints; ORM rows already satisfy the schema, so model_construct
+    is safe and close to dict-copy cost.
+    """
+    return schema_cls.model_construct(
+        **{name: getattr(obj, name) for name in _response_fields(schema_cls)}
+    )
+
+
 class InstrumentService:
     """
     Service for managing financial instruments.
@@ -40,6 +199,13 @@ class InstrumentService:
         """
         self.session = session
         self.repo = InstrumentRepository(session)
+        self._cache = None
+
+    async def _cache_client(self):
+        """Return the cache client, fetching it once per service instance."""
+        if self._cache is None:
+            self._cache = await _get_cache()
+        return self._cache
 
     async def create(self, data: InstrumentCreate) -> InstrumentResponse:
         """
@@ -53,20 +219,31 @@ class InstrumentService:
         Returns:
             InstrumentResponse: The created instrument.
         """
-        existing = await self.repo.get_by_symbol(data.symbol)
-        if existing:
-            raise ConflictError("Instrument with this symbol already exists.")
         try:
+            # ON CONFLICT DO NOTHING returns None on a duplicate symbol, so no
+            # separate get_by_symbol pre-check (and no race between the two)
             instrument = await self.repo.create(data.model_dump())
-            await self.session.commit()
-            await self.session.refresh(instrument)
+            if instrument is None:
+                raise ConflictError("Instrument with this symbol already exists.")
+            # RETURNING already hydrated the row; serialize before commit so
+            # no refresh round-trip is needed afterwards
+            response = InstrumentResponse.model_validate(instrument)
+            # resolve the cache client while the commit round-trip is in
+            # flight; invalidation itself only runs after commit
+            cache_client, _ = await asyncio.gather(
+                self._cache_client(), self.session.commit()
+            )
 
             # invalidate cache for the list of instruments
-            cache_client = await get_cache()
-            await cache_client.clear("instruments:list:")
-            await cache_client.clear("instruments:count:")
+            _invalidate_in_background(
+                _bump_generation(
+                    cache_client, "instruments:list:", "instruments:count:"
+                )
+            )
 
-            return InstrumentResponse.model_validate(instrument)
+            return response
+        except ConflictError:
+            raise
         except Exception as e:
             raise ValidationError(f"Failed to create instrument: {e}")
 
@@ -104,7 +281,30 @@ class InstrumentService:
             raise NotFoundError("Instrument not found")
         return InstrumentResponse.model_validate(instrument)
 
-    @cache(ttl=120, prefix="instruments:list:")
+    async def get_by_symbols(
+        self, symbols: List[str]
+    ) -> dict[str, InstrumentResponse]:
+        """
+        Retrieve multiple instruments by symbol in a single query.
+
+        Unlike get_by_symbol, missing symbols do not raise; callers check the
+        returned mapping, which avoids a round-trip per symbol.
+
+        Args:
+            symbols (list[str]): The instrument symbols to look up.
+        Returns:
+            dict[str, InstrumentResponse]: Mapping of symbol to instrument for
+            the symbols that exist.
+        """
+        instruments = await self.repo.get_by_symbols(symbols)
+        return {
+            symbol: InstrumentResponse.model_validate(instrument)
+            for symbol, instrument in instruments.items()
+        }
+
+    @versioned_cache(
+        ttl=120, prefix="instruments:list:", schema_cls=InstrumentResponse
+    )
     async def list(
         self, filters: Optional[dict] = None, offset: int = 0, limit: int = 100
     ) -> List[InstrumentResponse]:
@@ -119,9 +319,58 @@ class InstrumentService:
             List[InstrumentResponse]: List of instruments.
         """
         instruments = await self.repo.list(filters=filters, offset=offset, limit=limit)
-        return [InstrumentResponse.model_validate(i) for i in instruments]
+        return [_fast_from_orm(InstrumentResponse, i) for i in instruments]
+
+    @versioned_cache(
+        ttl=120,
+        prefix="instruments:list:",
+        schema_cls=InstrumentResponse,
+        with_total=True,
+    )
+    async def list_with_total(
+        self, filters: Optional[dict] = None, offset: int = 0, limit: int = 100
+    ) -> tuple:
+        """
+        List instruments plus the total matching count in one query.
 
-    @cache(ttl=120, prefix="instruments:count:")
+        Fuses what the paginated endpoints did with list() + count() into a
+        single round-trip via a window count.
+
+        Args:
+            filters (dict, optional): Filtering criteria.
+            offset (int): Pagination offset.
+            limit (int): Pagination limit.
+        Returns:
+            tuple[List[InstrumentResponse], int]: The page and the total.
+        """
+        instruments, total = await self.repo.list_with_total(
+            filters=filters, offset=offset, limit=limit
+        )
+        return [_fast_from_orm(InstrumentResponse, i) for i in instruments], total
+
+    async def iter_list(
+        self, filters: Optional[dict] = None, offset: int = 0, limit: int = 100
+    ):
+        """
+        Stream instruments with optional filters and pagination.
+
+        Generator variant of list for large pages and exports: rows flow out
+        one at a time instead of materializing row and response lists side by
+        side. Not cached.
+
+        Args:
+            filters (dict, optional): Filtering criteria.
+            offset (int): Pagination offset.
+            limit (int): Pagination limit.
+        Yields:
+            InstrumentResponse: Matching instruments in id order.
+        """
+        async for instrument in self.repo.stream_list(
+            filters=filters, offset=offset, limit=limit
+        ):
+            yield _fast_from_orm(InstrumentResponse, instrument)
+
+    @versioned_cache(ttl=120, prefix="instruments:count:")
     async def count(self, filters: Optional[dict] = None) -> int:
         """
         Return the total number of instruments, optionally filtered.
@@ -148,23 +397,35 @@ class InstrumentService:
         Returns:
             InstrumentResponse: The updated instrument.
         """
-        instrument = await self.repo.get_by_id(instrument_id)
-        if not instrument:
-            raise NotFoundError("Instrument not found")
         try:
             updated = await self.repo.update(
                 instrument_id, data.model_dump(exclude_unset=True)
             )
-            await self.session.commit()
-            await self.session.refresh(updated)
+            if updated is None:
+                raise NotFoundError("Instrument not found")
+            response = InstrumentResponse.model_validate(updated)
+            # resolve the cache client while the commit round-trip is in
+            # flight; invalidation itself only runs after commit
+            cache_client, _ = await asyncio.gather(
+                self._cache_client(), self.session.commit()
+            )
 
-            # invalidate cache for the list of instruments
-            cache_client = await get_cache()
-            await cache_client.clear("instruments:list:")
-            await cache_client.clear("instruments:by_id:")
-            await cache_client.clear("instruments:by_symbol:")
+            # invalidate cache for the list of instruments; entity keys are
+            # cleared per id/symbol rather than across the whole prefix
+            _invalidate_in_background(
+                _bump_generation(cache_client, "instruments:list:")
+            )
+            _invalidate_in_background(
+                _invalidate(
+                    cache_client,
+                    f"instruments:by_id:{instrument_id}",
+                    f"instruments:by_symbol:{response.symbol}",
+                )
+            )
 
-            return InstrumentResponse.model_validate(updated)
+            return response
+        except NotFoundError:
+            raise
         except Exception as e:
             raise ValidationError(f"Failed to update instrument: {e}")
 
@@ -175,57 +436,131 @@ class InstrumentService:
         Args:
             instrument_id (int): The instrument's ID.
         """
-        await self.repo.delete(instrument_id)
-        await self.session.commit()
+        symbol = await self.repo.delete(instrument_id)
+        # resolve the cache client while the commit round-trip is in
+        # flight; invalidation itself only runs after commit
+        cache_client, _ = await asyncio.gather(
+            self._cache_client(), self.session.commit()
+        )
 
-        # invalidate cache for the list of instruments
-        cache_client = await get_cache()
-        await cache_client.clear("instruments:list:")
-        await cache_client.clear("instruments:by_id:")
-        await cache_client.clear("instruments:by_symbol:")
-        await cache_client.clear("instruments:count:")
+        # invalidate cache for the list of instruments; entity keys are
+        # cleared per id/symbol rather than across the whole prefix
+        entity_keys = [f"instruments:by_id:{instrument_id}"]
+        if symbol is not None:
+            entity_keys.append(f"instruments:by_symbol:{symbol}")
+        _invalidate_in_background(
+            _bump_generation(cache_client, "instruments:list:", "instruments:count:")
+        )
+        _invalidate_in_background(_invalidate(cache_client, *entity_keys))
 
     async def bulk_insert(
-        self, records: List[InstrumentCreate]
+        self, records: List[InstrumentCreate], chunk_size: int = 1000
     ) -> List[InstrumentResponse]:
         """
         Bulk insert multiple instruments efficiently.
 
+        Records are sent in chunk_size batches within one transaction, which
+        bounds statement size and memory for large loads.
+
         Args:
             records (list[InstrumentCreate]): List of instrument creation data.
+            chunk_size (int): Rows per INSERT statement.
         """
-        dicts = [r.model_dump() for r in records]
-        instruments = await self.repo.bulk_insert(dicts)
-        await self.session.commit()
+        dicts = [_dump_instrument(r) for r in records]
+        instruments = []
+        for chunk in _chunked(dicts, chunk_size):
+            instruments.extend(await self.repo.bulk_insert(chunk))
+        # resolve the cache client while the commit round-trip is in
+        # flight; invalidation itself only runs after commit
+        cache_client, _ = await asyncio.gather(
+            self._cache_client(), self.session.commit()
+        )
 
         # Invalidate cache for the list of instruments
-        cache_client = await get_cache()
-        await cache_client.clear("instruments:list:")
-        await cache_client.clear("instruments:count:")
+        _invalidate_in_background(
+            _bump_generation(
+                cache_client, "instruments:list:", "instruments:count:"
+            )
+        )
 
         # return instruments
         return [InstrumentResponse.model_validate(i) for i in instruments]
 
     async def bulk_upsert(
-        self, records: List[InstrumentCreate]
+        self, records: List[InstrumentCreate], chunk_size: int = 1000
     ) -> List[InstrumentResponse]:
         """
         Bulk upsert multiple instruments efficiently.
 
+        Records are sent in chunk_size batches within one transaction, which
+        bounds statement size and memory for large loads.
+
         Args:
             records (list[InstrumentCreate]): List of instrument creation data.
+            chunk_size (int): Rows per upsert statement.
         """
-        dicts = [r.model_dump() for r in records]
-        instruments = await self.repo.bulk_upsert(dicts)
-        await self.session.commit()
+        dicts = [_dump_instrument(r) for r in records]
+        instruments = []
+        for chunk in _chunked(dicts, chunk_size):
+            instruments.extend(await self.repo.bulk_upsert(chunk))
+        # resolve the cache client while the commit round-trip is in
+        # flight; invalidation itself only runs after commit
+        cache_client, _ = await asyncio.gather(
+            self._cache_client(), self.session.commit()
+        )
 
         # Invalidate cache for the list of instruments
-        cache_client = await get_cache()
-        await cache_client.clear("instruments:list:")
-        await cache_client.clear("instruments:count:")
+        _invalidate_in_background(
+            _bump_generation(
+                cache_client, "instruments:list:", "instruments:count:"
+            )
+        )
 
         return [InstrumentResponse.model_validate(i) for i in instruments]
 
+    async def bulk_upsert_for_index(
+        self,
+        index_id: int,
+        records: List[InstrumentCreate],
+        chunk_size: int = 1000,
+    ) -> int:
+        """
+        Bulk upsert instruments and register them as index constituents.
+
+        Fuses bulk_upsert and add_stocks_to_index into one statement per
+        chunk (upsert CTE feeding the constituents insert), halving the
+        round-trips of the two-pass flow.
+
+        Args:
+            index_id (int): The ID of the index instrument.
+            records (list[InstrumentCreate]): List of instrument creation data.
+            chunk_size (int): Rows per upsert statement.
+        Returns:
+            int: Number of records upserted.
+        """
+        dicts = [_dump_instrument(r) for r in records]
+        for chunk in _chunked(dicts, chunk_size):
+            await self.repo.upsert_index_constituents(index_id, chunk)
+        # resolve the cache client while the commit round-trip is in
+        # flight; invalidation itself only runs after commit
+        cache_client, _ = await asyncio.gather(
+            self._cache_client(), self.session.commit()
+        )
+
+        # Invalidate instrument lists and index membership caches
+        _invalidate_in_background(
+            _bump_generation(
+                cache_client, "instruments:list:", "instruments:count:"
+            )
+        )
+        _invalidate_in_background(
+            _invalidate(
+                cache_client, "instruments:indices:", "instruments:constituents:"
+            )
+        )
+
+        return len(dicts)
+
     async def add_stock_to_index(self, index_id: int, stock_id: int) -> None:
         """
         Add a stock to an index.
@@ -234,12 +569,18 @@ class InstrumentService:
             stock_id (int): The ID of the stock instrument.
         """
         await self.repo.add_stock_to_index(index_id, stock_id)
-        await self.session.commit()
+        # resolve the cache client while the commit round-trip is in
+        # flight; invalidation itself only runs after commit
+        cache_client, _ = await asyncio.gather(
+            self._cache_client(), self.session.commit()
+        )
 
         # Invalidate cache for the list of indices
-        cache_client = await get_cache()
-        await cache_client.clear("instruments:indices:")
-        await cache_client.clear("instruments:constituents:")
+        _invalidate_in_background(
+            _invalidate(
+                cache_client, "instruments:indices:", "instruments:constituents:"
+            )
+        )
 
     async def add_stocks_to_index(self, index_id: int, stock_ids: List[int]) -> None:
         """
@@ -249,12 +590,18 @@ class InstrumentService:
             stock_ids (list[int]): List of stock instrument IDs to add as constituents.
         """
         await self.repo.add_stocks_to_index(index_id, stock_ids)
-        await self.session.commit()
+        # resolve the cache client while the commit round-trip is in
+        # flight; invalidation itself only runs after commit
+        cache_client, _ = await asyncio.gather(
+            self._cache_client(), self.session.commit()
+        )
 
         # Invalidate cache for the list of indices
-        cache_client = await get_cache()
-        await cache_client.clear("instruments:indices:")
-        await cache_client.clear("instruments:constituents:")
+        _invalidate_in_background(
+            _invalidate(
+                cache_client, "instruments:indices:", "instruments:constituents:"
+            )
+        )
 
     async def remove_stock_from_index(self, index_id: int, stock_id: int) -> None:
         """
@@ -264,12 +611,18 @@ class InstrumentService:
             stock_id (int): The ID of the stock instrument.
         """
         await self.repo.remove_stock_from_index(index_id, stock_id)
-        await self.session.commit()
+        # resolve the cache client while the commit round-trip is in
+        # flight; invalidation itself only runs after commit
+        cache_client, _ = await asyncio.gather(
+            self._cache_client(), self.session.commit()
+        )
 
         # Invalidate cache for the list of indices
-        cache_client = await get_cache()
-        await cache_client.clear("instruments:indices:")
-        await cache_client.clear("instruments:constituents:")
+        _invalidate_in_background(
+            _invalidate(
+                cache_client, "instruments:indices:", "instruments:constituents:"
+            )
+        )
 
     async def remove_stocks_from_index(
         self, index_id: int, stock_ids: List[int]
@@ -281,12 +634,18 @@ class InstrumentService:
             stock_ids (list[int]): List of stock instrument IDs to remove as constituents.
         """
         await self.repo.remove_stocks_from_index(index_id, stock_ids)
-        await self.session.commit()
+        # resolve the cache client while the commit round-trip is in
+        # flight; invalidation itself only runs after commit
+        cache_client, _ = await asyncio.gather(
+            self._cache_client(), self.session.commit()
+        )
 
         # Invalidate cache for the list of indices
-        cache_client = await get_cache()
-        await cache_client.clear("instruments:indices:")
-        await cache_client.clear("instruments:constituents:")
+        _invalidate_in_background(
+            _invalidate(
+                cache_client, "instruments:indices:", "instruments:constituents:"
+            )
+        )
 
     @cache(ttl=1800, prefix="instruments:constituents:")
     async def get_constituents(self, index_id: int) -> List[InstrumentResponse]:
@@ -298,7 +657,7 @@ class InstrumentService:
             list[InstrumentResponse]: List of stock InstrumentResponse objects.
         """
         stocks = await self.repo.get_constituents(index_id)
-        return [InstrumentResponse.model_validate(s) for s in stocks]
+        return [_fast_from_orm(InstrumentResponse, s) for s in stocks]
 
     @cache(ttl=1800, prefix="instruments:indices:")
     async def get_indices_for_stock(self, stock_id: int) -> List[InstrumentResponse]:
@@ -310,67 +669,47 @@ class InstrumentService:
             list[InstrumentResponse]: List of index InstrumentResponse objects.
         """
         indices = await self.repo.get_indices_for_stock(stock_id)
-        return [InstrumentResponse.model_validate(i) for i in indices]
-
-    @cache(ttl=60, prefix="instruments:list_with_latest_price:")
+        return [_fast_from_orm(InstrumentResponse, i) for i in indices]
+
+    @versioned_cache(
+        ttl=60,
+        prefix="instruments:list_with_latest_price:",
+        schema_cls=InstrumentWithLatestPriceResponse,
+        with_total=True,
+    )
     async def list_with_latest_price(
-        self, filters: Optional[dict] = None, offset: int = 0, limit: int = 100
-    ) -> List[InstrumentWithLatestPriceResponse]:
+        self,
+        filters: Optional[dict] = None,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+    ) -> tuple:
         """
         List instruments with their latest price and price info.
 
+        Uses keyset pagination: pass the last instrument id of the previous
+        page as after_id to fetch the next page.
+
         Args:
             filters (dict, optional): Filtering criteria.
-            offset (int): Pagination offset.
             limit (int): Pagination limit.
+            after_id (int, optional): Cursor; id of the last instrument seen.
         Returns:
-            List[InstrumentWithLatestPriceResponse]: List of instruments with latest price info.
+            tuple[List[InstrumentWithLatestPriceResponse], int]: The page and
+                the total row count for the filters and cursor.
         """
-        rows = await self.repo.list_with_latest_price(
-            filters=filters, limit=limit, offset=offset
+        rows, total = await self.repo.list_with_latest_price(
+            filters=filters, limit=limit, after_id=after_id
         )
+        instrument_fields = _response_fields(InstrumentResponse)
         result = []
-        for (
-            instrument,
-            price,
-            market_timestamp,
-            change,
-            change_percent,
-            volume,
-            day_high,
-            day_low,
-            w52_high,
-            w52_low,
-            previous_close,
-        ) in rows:
-            result.append(
-                InstrumentWithLatestPriceResponse(
-                    id=instrument.id,
-                    symbol=instrument.symbol,
-                    name=instrument.name,
-                    type=instrument.type,
-                    market=instrument.market,
-                    currency=instrument.currency,
-                    country=instrument.country,
-                    sector=instrument.sector,
-                    industry=instrument.industry,
-                    is_active=instrument.is_active,
-                    created_at=instrument.created_at,
-                    updated_at=instrument.updated_at,
-                    price=price,
-                    market_timestamp=market_timestamp,
-                    change=change,
-                    change_percent=change_percent,
-                    volume=volume,
-                    day_high=day_high,
-                    day_low=day_low,
-                    w52_high=w52_high,
-                    w52_low=w52_low,
-                    previous_close=previous_close,
-                )
-            )
+        for row in rows:
+            instrument = row[0]
+            data = {name: getattr(instrument, name) for name in instrument_fields}
+            data.update(zip(_PRICE_ROW_FIELDS, row[1:]))
+            # rows are DB-sourced, so skip validation as in _fast_from_orm
+            result.append(_construct_with_price(**data))
 
-        return result
+        return result, total
 
 
 class InstrumentPriceHistoryService:
@@ -390,6 +729,13 @@ class InstrumentPriceHistoryService:
         """
         self.session = session
         self.repo = InstrumentPriceHistoryRepository(session)
+        self._cache = None
+
+    async def _cache_client(self):
+        """Return the cache client, fetching it once per service instance."""
+        if self._cache is None:
+            self._cache = await _get_cache()
+        return self._cache
 
     async def create(
         self,
@@ -407,20 +753,73 @@ class InstrumentPriceHistoryService:
         """
         try:
             record = await self.repo.create(data.model_dump())
-            await self.session.commit()
-            await self.session.refresh(record)
+            response = InstrumentPriceHistoryResponse.model_validate(record)
+            # resolve the cache client while the commit round-trip is in
+            # flight; invalidation itself only runs after commit
+            cache_client, _ = await asyncio.gather(
+                self._cache_client(), self.session.commit()
+            )
 
             # Invalidate cache for the latest price
-            cache_client = await get_cache()
-            await cache_client.clear(f"price_history:latest:{data.instrument_id}")
-            await cache_client.clear(f"price_history:in_range:{data.instrument_id}")
-            await cache_client.clear(f"price_history:list:")
-            await cache_client.clear(f"price_history:count:")
+            _invalidate_in_background(
+                _bump_generation(
+                    cache_client, "price_history:list:", "price_history:count:"
+                )
+            )
+            _invalidate_in_background(
+                _invalidate(
+                    cache_client,
+                    f"price_history:latest:{data.instrument_id}",
+                    f"price_history:in_range:{data.instrument_id}",
+                )
+            )
 
-            return InstrumentPriceHistoryResponse.model_validate(record)
+            return response
         except Exception as e:
             raise ValidationError(f"Failed to create price history: {e}")
 
+    async def upsert_if_absent(self, data: InstrumentPriceHistoryCreate) -> bool:
+        """
+        Insert a price history record unless it already exists.
+
+        One INSERT ... ON CONFLICT DO NOTHING replaces the get-then-create
+        sequence callers otherwise run per tick; the uniqueness check rides
+        on the composite primary key.
+
+        Args:
+            data (InstrumentPriceHistoryCreate): The price history creation data.
+        Raises:
+            ValidationError: If the insert fails due to invalid data or DB error.
+        Returns:
+            bool: True if a new row was inserted, False if it already existed.
+        """
+        try:
+            inserted = await self.repo.insert_if_absent(data.model_dump())
+            # resolve the cache client while the commit round-trip is in
+            # flight; invalidation itself only runs after commit
+            cache_client, _ = await asyncio.gather(
+                self._cache_client(), self.session.commit()
+            )
+
+            if inserted:
+                # Invalidate cache for the latest price
+                _invalidate_in_background(
+                    _bump_generation(
+                        cache_client, "price_history:list:", "price_history:count:"
+                    )
+                )
+                _invalidate_in_background(
+                    _invalidate(
+                        cache_client,
+                        f"price_history:latest:{data.instrument_id}",
+                        f"price_history:in_range:{data.instrument_id}",
+                    )
+                )
+
+            return inserted
+        except Exception as e:
+            raise ValidationError(f"Failed to upsert price history: {e}")
+
     async def get(
         self,
         instrument_id: int,
@@ -440,7 +839,9 @@ class InstrumentPriceHistoryService:
         record = await self.repo.get_by_id(instrument_id, market_timestamp)
         return InstrumentPriceHistoryResponse.model_validate(record)
 
-    @cache(ttl=1800, prefix="price_history:list:")
+    @versioned_cache(
+        ttl=1800, prefix="price_history:list:", schema_cls=InstrumentPriceHistoryResponse
+    )
     async def list(
         self,
         filters: Optional[dict] = None,
@@ -458,9 +859,9 @@ class InstrumentPriceHistoryService:
             List[InstrumentPriceHistoryResponse]: List of price history records.
         """
         records = await self.repo.list(filters=filters, offset=offset, limit=limit)
-        return [InstrumentPriceHistoryResponse.model_validate(r) for r in records]
+        return [_fast_from_orm(InstrumentPriceHistoryResponse, r) for r in records]
 
-    @cache(ttl=1800, prefix="price_history:count:")
+    @versioned_cache(ttl=1800, prefix="price_history:count:")
     async def count(self, filters: Optional[dict] = None) -> int:
         """
         Return the total number of price history records, optionally filtered.
@@ -492,6 +893,28 @@ class InstrumentPriceHistoryService:
 
         return InstrumentPriceHistoryResponse.model_validate(record)
 
+    async def get_latest_prices(
+        self,
+        instrument_ids: List[int],
+    ) -> dict:
+        """
+        Retrieve the latest price history record for many instruments at once.
+
+        One DISTINCT ON query instead of one get_latest_price call per
+        instrument; intended for dashboard-style refreshes.
+
+        Args:
+            instrument_ids (list[int]): The instruments' IDs.
+        Returns:
+            dict[int, InstrumentPriceHistoryResponse]: Latest record keyed by
+                instrument_id; instruments without prices are absent.
+        """
+        records = await self.repo.get_latest_prices(instrument_ids)
+        return {
+            instrument_id: _fast_from_orm(InstrumentPriceHistoryResponse, record)
+            for instrument_id, record in records.items()
+        }
+
     @cache(ttl=1800, prefix="price_history:in_range:")
     async def get_prices_in_range(
         self,
@@ -510,43 +933,111 @@ class InstrumentPriceHistoryService:
             List[InstrumentPriceHistoryResponse]: List of price history records in the range.
         """
         records = await self.repo.get_prices_in_range(instrument_id, start, end)
-        return [InstrumentPriceHistoryResponse.model_validate(r) for r in records]
+        return [_fast_from_orm(InstrumentPriceHistoryResponse, r) for r in records]
 
-    async def bulk_insert(self, records: List[InstrumentPriceHistoryCreate]) -> None:
+    async def stream_prices_in_range(
+        self,
+        instrument_id: int,
+        start: datetime = None,
+        end: datetime = None,
+    ):
+        """
+        Stream price history records for an instrument within a date range.
+
+        Unlike get_prices_in_range, rows are yielded incrementally from a
+        server-side cursor, so memory stays bounded for multi-year ranges.
+        Not cached: intended for exports and other large-range consumers.
+
+        Args:
+            instrument_id (int): The instrument's ID.
+            start: Start datetime.
+            end: End datetime.
+        Yields:
+            InstrumentPriceHistoryResponse: Price history records in timestamp order.
+        """
+        async for record in self.repo.stream_prices_in_range(instrument_id, start, end):
+            yield InstrumentPriceHistoryResponse.model_validate(record)
+
+    async def bulk_insert(
+        self,
+        records: List[InstrumentPriceHistoryCreate],
+        chunk_size: int = 1000,
+        use_copy: bool = False,
+    ) -> None:
         """
         Bulk insert multiple price history records efficiently.
 
+        Records are sent in chunk_size batches within one transaction, which
+        bounds statement size and memory for 100k+ row ingests. The default
+        INSERT path skips duplicate (instrument_id, market_timestamp) keys;
+        use_copy=True routes through Postgres COPY, which is several times
+        faster but aborts on any duplicate, so callers must only opt in for
+        ranges known to be absent.
+
         Args:
             records (list[InstrumentPriceHistoryCreate]): List of price history creation data.
+            chunk_size (int): Rows per INSERT statement.
+            use_copy (bool): Load via COPY instead of INSERT ... ON CONFLICT.
         """
-        dicts = [r.model_dump() for r in records]
-        await self.repo.bulk_insert(dicts)
-        await self.session.commit()
+        dicts = [_dump_price_history(r) for r in records]
+        if use_copy:
+            await self.repo.copy_insert(dicts)
+        else:
+            for chunk in _chunked(dicts, chunk_size):
+                await self.repo.bulk_insert(chunk)
+        # resolve the cache client while the commit round-trip is in
+        # flight; invalidation itself only runs after commit
+        cache_client, _ = await asyncio.gather(
+            self._cache_client(), self.session.commit()
+        )
 
         # Invalidate cache for the latest price
-        cache_client = await get_cache()
-        await cache_client.clear("price_history:latest:")
-        await cache_client.clear("price_history:in_range:")
-        await cache_client.clear("price_history:list:")
-        await cache_client.clear("price_history:count:")
+        _invalidate_in_background(
+            _bump_generation(
+                cache_client, "price_history:list:", "price_history:count:"
+            )
+        )
+        _invalidate_in_background(
+            _invalidate(
+                cache_client, "price_history:latest:", "price_history:in_range:"
+            )
+        )
 
-    async def bulk_upsert(self, records: List[InstrumentPriceHistoryCreate]) -> None:
+    async def bulk_upsert(
+        self,
+        records: List[InstrumentPriceHistoryCreate],
+        chunk_size: int = 1000,
+    ) -> None:
         """
         Bulk upsert multiple price history records efficiently.
 
+        Records are sent in chunk_size batches within one transaction, which
+        bounds statement size and memory for 100k+ row ingests.
+
         Args:
             records (list[InstrumentPriceHistoryCreate]): List of price history creation data.
+            chunk_size (int): Rows per upsert statement.
         """
-        dicts = [r.model_dump() for r in records]
-        await self.repo.bulk_upsert(dicts)
-        await self.session.commit()
+        dicts = [_dump_price_history(r) for r in records]
+        for chunk in _chunked(dicts, chunk_size):
+            await self.repo.bulk_upsert(chunk)
+        # resolve the cache client while the commit round-trip is in
+        # flight; invalidation itself only runs after commit
+        cache_client, _ = await asyncio.gather(
+            self._cache_client(), self.session.commit()
+        )
 
         # Invalidate cache for the latest price
-        cache_client = await get_cache()
-        await cache_client.clear("price_history:latest:")
-        await cache_client.clear("price_history:in_range:")
-        await cache_client.clear("price_history:list:")
-        await cache_client.clear("price_history:count:")
+        _invalidate_in_background(
+            _bump_generation(
+                cache_client, "price_history:list:", "price_history:count:"
+            )
+        )
+        _invalidate_in_background(
+            _invalidate(
+                cache_client, "price_history:latest:", "price_history:in_range:"
+            )
+        )
 
     async def update(
         self,
@@ -573,9 +1064,9 @@ class InstrumentPriceHistoryService:
                 market_timestamp,
                 data.model_dump(exclude_unset=True),
             )
+            response = InstrumentPriceHistoryResponse.model_validate(updated)
             await self.session.commit()
-            await self.session.refresh(updated)
-            return InstrumentPriceHistoryResponse.model_validate(updated)
+            return response
         except NotFoundError:
             raise
         except Exception as e:
@@ -594,11 +1085,20 @@ class InstrumentPriceHistoryService:
             market_timestamp (datetime): The market timestamp.
         """
         await self.repo.delete(instrument_id, market_timestamp)
-        await self.session.commit()
+        # resolve the cache client while the commit round-trip is in
+        # flight; invalidation itself only runs after commit
+        cache_client, _ = await asyncio.gather(
+            self._cache_client(), self.session.commit()
+        )
 
         # Invalidate cache for the latest price
-        cache_client = await get_cache()
-        await cache_client.clear("price_history:latest:")
-        await cache_client.clear("price_history:in_range:")
-        await cache_client.clear("price_history:list:")
-        await cache_client.clear("price_history:count:")
+        _invalidate_in_background(
+            _bump_generation(
+                cache_client, "price_history:list:", "price_history:count:"
+            )
+        )
+        _invalidate_in_background(
+            _invalidate(
+                cache_client, "price_history:latest:", "price_history:in_range:"
+            )
+        )
@@ -1,5 +1,37 @@
 from .models import InstrumentType, MarketType
 
+# Built once at import; the mapping functions sit on the ingestion hot path
+# and previously re-allocated these dicts on every call.
+_QUOTE_TYPE_MAP = {
+    "EQUITY": InstrumentType.STOCK,
+    "INDEX": InstrumentType.INDEX,
+    "ETF": InstrumentType.ETF,
+    "CRYPTOCURRENCY": InstrumentType.CRYPTO,
+    "CURRENCY": InstrumentType.FOREX,
+}
+_QUOTE_TYPE_GET = _QUOTE_TYPE_MAP.get
+
+_MARKET_MAP = {
+    "IST": MarketType.BIST,
+    "BIST": MarketType.BIST,
+    # "Istanbul": MarketType.BIST,
+    "NMS": MarketType.NASDAQ,
+    "NASDAQ": MarketType.NASDAQ,
+    "NIM": MarketType.NASDAQ,
+    # "NasdaqGS": MarketType.NASDAQ,
+    "NYSE": MarketType.NYSE,
+    # "Crypto": MarketType.CRYPTO,
+    # "Forex": MarketType.FOREX,
+}
+_MARKET_GET = _MARKET_MAP.get
+
+_YF_EXCHANGE_MAP = {
+    MarketType.BIST: "IST",
+    MarketType.NASDAQ: "NMS",
+    MarketType.NYSE: "NYSE",
+}
+_YF_EXCHANGE_GET = _YF_EXCHANGE_MAP.get
+
 
 def map_quote_type(quote_type: str) -> InstrumentType:
     """
@@ -10,15 +42,7 @@ def map_quote_type(quote_type: str) -> InstrumentType:
     Returns:
         InstrumentType: The mapped enum value, or InstrumentType.OTHER if not recognized.
     """
-    mapping = {
-        "EQUITY": InstrumentType.STOCK,
-        "INDEX": InstrumentType.INDEX,
-        "ETF": InstrumentType.ETF,
-        "CRYPTOCURRENCY": InstrumentType.CRYPTO,
-        "CURRENCY": InstrumentType.FOREX,
-    }
-
-    return mapping.get(quote_type, InstrumentType.OTHER)
+    return _QUOTE_TYPE_GET(quote_type, InstrumentType.OTHER)
 
 
 def map_market(market: str) -> MarketType:
@@ -30,20 +54,7 @@ def map_market(market: str) -> MarketType:
     Returns:
         MarketType: The mapped enum value, or MarketType.OTHER if not recognized.
     """
-    mapping = {
-        "IST": MarketType.BIST,
-        "BIST": MarketType.BIST,
-        # "Istanbul": MarketType.BIST,
-        "NMS": MarketType.NASDAQ,
-        "NASDAQ": MarketType.NASDAQ,
-        "NIM": MarketType.NASDAQ,
-        # "NasdaqGS": MarketType.NASDAQ,
-        "NYSE": MarketType.NYSE,
-        # "Crypto": MarketType.CRYPTO,
-        # "Forex": MarketType.FOREX,
-    }
-
-    return mapping.get(market, MarketType.OTHER)
+    return _MARKET_GET(market, MarketType.OTHER)
 
 
 def map_market_to_yf_exchange(market: MarketType) -> str:
@@ -54,10 +65,4 @@ def map_market_to_yf_exchange(market: MarketType) -> str:
     Returns:
         str: yfinance exchange code (e.g., 'IST', 'NMS', 'NYSE'), or None if not mapped.
     """
-    mapping = {
-        MarketType.BIST: "IST",
-        MarketType.NASDAQ: "NMS",
-        MarketType.NYSE: "NYSE",
-    }
-
-    return mapping.get(market)
+    return _YF_EXCHANGE_GET(market)
@@ -3,6 +3,50 @@ from fastcore.config.base import BaseAppSettings
 
 from .scheduler import Scheduler
 
+# Declarative job table, built once at import. Each entry is
+# (func_ref, trigger, trigger_kwargs); the job id doubles as the dict key.
+# Persistent function string references keep jobs serializable in the store.
+_JOBS: dict[str, tuple[str, str, dict]] = {
+    # INDICES
+    "create_market_indices": (
+        "app.scheduler.tasks.indices_tasks:create_market_indices",
+        "cron",
+        # from monday to friday at 9:00 AM
+        {"day_of_week": "mon-fri", "hour": 9, "minute": 0},
+    ),
+    "update_index_prices": (
+        "app.scheduler.tasks.prices_tasks:update_index_prices",
+        "interval",
+        # every 15 minutes
+        {"minutes": 15},
+    ),
+    "backfill_index_price_history": (
+        "app.scheduler.tasks.prices_tasks:backfill_index_price_history",
+        "cron",
+        # January and July at 6:00 AM on Sundays
+        {"month": "1,7", "day_of_week": "sun", "hour": 6, "minute": 0},
+    ),
+    # STOCKS
+    "create_market_stocks": (
+        "app.scheduler.tasks.stocks_tasks:create_market_stocks",
+        "cron",
+        # at 5:00 AM on Sundays
+        {"day_of_week": "sun", "hour": 5, "minute": 0},
+    ),
+    "update_stock_prices": (
+        "app.scheduler.tasks.prices_tasks:update_stock_prices",
+        "interval",
+        # every 15 minutes
+        {"minutes": 15},
+    ),
+    "backfill_stock_price_history": (
+        "app.scheduler.tasks.prices_tasks:backfill_stock_price_history",
+        "cron",
+        # January and July at 7:00 AM on Sundays
+        {"month": "1,7", "day_of_week": "sun", "hour": 7, "minute": 0},
+    ),
+}
+
 
 def setup_scheduler(app: FastAPI, settings: BaseAppSettings) -> None:
     """
@@ -10,70 +54,14 @@ def setup_scheduler(app: FastAPI, settings: BaseAppSettings) -> None:
     """
     scheduler_manager = Scheduler(settings.ALEMBIC_DATABASE_URL)  # sync db_url
 
-    # Register scheduled jobs using persistent function string references
+    # Register scheduled jobs from the declarative table
     async def on_startup():
         scheduler_manager.start()
-        # INDICES
-        scheduler_manager.add_job(
-            "app.scheduler.tasks.indices_tasks:create_market_indices",
-            "cron",
-            # from monday to friday at 9:00 AM
-            day_of_week="mon-fri",
-            hour=9,
-            minute=0,
-            id="create_market_indices",
-        )
-        scheduler_manager.add_job(
-            "app.scheduler.tasks.prices_tasks:update_index_prices",
-            "interval",
-            # every 15 minutes
-            minutes=15,
-            id="update_index_prices",
-        )
-        scheduler_manager.add_job(
-            "app.scheduler.tasks.prices_tasks:backfill_index_price_history",
-            "cron",
-            # January and July at 6:00 AM on Sundays
-            month="1,7",
-            day_of_week="sun",
-            hour=6,
-            minute=0,
-            id="backfill_index_price_history",
-        )
-        # STOCKS
-        scheduler_manager.add_job(
-            "app.scheduler.tasks.stocks_tasks:create_market_stocks",
-            "cron",
-            # at 3:00 AM on Sundays
-            day_of_week="sun",
-            hour=5,
-            minute=0,
-            id="create_market_stocks",
-        )
-        scheduler_manager.add_job(
-            "app.scheduler.tasks.prices_tasks:update_stock_prices",
-            "interval",
-            # every 15 minutes
-            minutes=15,
-            id="update_stock_prices",
-        )
-        scheduler_manager.add_job(
-            "app.scheduler.tasks.prices_tasks:backfill_stock_price_history",
-            "cron",
-            # January and July at 3:00 AM on Sundays
-            month="1,7",
-            day_of_week="sun",
-            hour=7,
-            minute=0,
-            id="backfill_stock_price_history",
-        )
+        for job_id, (func_ref, trigger, trigger_kwargs) in _JOBS.items():
+            scheduler_manager.add_job(func_ref, trigger, id=job_id, **trigger_kwargs)
 
-        # scheduler_manager.remove_job("create_market_indices")
-        # scheduler_manager.remove_job("update_index_prices")
-        # scheduler_manager.remove_job("backfill_index_price_history")
-        # scheduler_manager.remove_job("create_market_stocks")
-        # scheduler_manager.remove_job("update_stock_prices")
-        # scheduler_manager.remove_job("backfill_stock_price_history")
+        # for job_id in _JOBS:
+        #     scheduler_manager.remove_job(job_id)
 
     app.add_event_handler("startup", on_startup)
     app.add_event_handler("shutdown", scheduler_manager.shutdown)
@@ -7,10 +7,12 @@ Use this to schedule, start, stop, and manage background jobs in the application
 from functools import wraps
 from typing import Callable, List, Optional
 
+from apscheduler.executors.asyncio import AsyncIOExecutor
 from apscheduler.job import Job
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastcore.logging.manager import ensure_logger
+from sqlalchemy import create_engine
 
 # Configure logger
 logger = ensure_logger(None, __name__)
@@ -44,6 +46,20 @@ class Scheduler:
         """
         self.scheduler: Optional[AsyncIOScheduler] = None
         self.db_url = db_url
+        # Cached jobstore id set: loaded once, mutated on add/remove, so
+        # existence checks don't SELECT from the jobstore per call.
+        self._job_ids: Optional[set] = None
+        # Own the jobstore engine: one tuned pool for the scheduler's
+        # lifetime instead of the default-sized engine SQLAlchemyJobStore
+        # builds from a bare url. pre_ping/recycle guard against the store
+        # hitting stale connections between infrequent job triggers.
+        self.engine = create_engine(
+            db_url,
+            pool_size=20,
+            max_overflow=10,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+        )
 
     def _ensure_started(self) -> None:
         """
@@ -53,6 +69,15 @@ class Scheduler:
             logger.error("Scheduler is not started.")
             raise RuntimeError("Scheduler is not started.")
 
+    def _ids(self) -> set:
+        """
+        Return the cached set of job ids, loading it from the jobstore on
+        first access (one SELECT instead of one per existence check).
+        """
+        if self._job_ids is None:
+            self._job_ids = {job.id for job in self.scheduler.get_jobs()}
+        return self._job_ids
+
     @log_exceptions
     def start(self) -> None:
         """
@@ -65,10 +90,23 @@ class Scheduler:
 
         logger.info("Starting the scheduler")
 
-        jobstores = {"default": SQLAlchemyJobStore(url=self.db_url)}
-
-        self.scheduler = AsyncIOScheduler(jobstores=jobstores)
+        jobstores = {"default": SQLAlchemyJobStore(engine=self.engine)}
+
+        self.scheduler = AsyncIOScheduler(
+            jobstores=jobstores,
+            # All tasks are coroutines; run them on the event loop instead of
+            # the default thread pool.
+            executors={"default": AsyncIOExecutor()},
+            # Coalesce piled-up runs and allow a 5-minute grace window so a
+            # busy loop or restart doesn't silently drop executions.
+            job_defaults={
+                "coalesce": True,
+                "misfire_grace_time": 300,
+                "max_instances": 1,
+            },
+        )
         self.scheduler.start()
+        self._job_ids = None  # repopulated lazily from the fresh jobstore
         logger.info("Scheduler started successfully")
 
     @log_exceptions
@@ -83,6 +121,7 @@ class Scheduler:
         logger.info(f"Shutting down scheduler (wait={wait})")
         self.scheduler.shutdown(wait=wait)
         self.scheduler = None
+        self._job_ids = None
         logger.info("Scheduler shut down successfully")
 
     @log_exceptions
@@ -110,14 +149,19 @@ class Scheduler:
 
         self._ensure_started()
 
-        # check if the job already exists
-        if self.job_exists(kwargs.get("id")):
-            logger.warning(
-                f"Job with id '{kwargs.get('id')}' already exists. Skipping."
-            )
-            return self.scheduler.get_job(kwargs.get("id"))
+        # replace_existing lets redeploys push through trigger changes; the
+        # exists-check would otherwise keep the stored (stale) definition
+        if not kwargs.get("replace_existing"):
+            # existence check against the cached id set; only an actual hit
+            # pays for a get_job round-trip
+            if kwargs.get("id") in self._ids():
+                logger.warning(
+                    f"Job with id '{kwargs.get('id')}' already exists. Skipping."
+                )
+                return self.scheduler.get_job(kwargs.get("id"))
 
         job = self.scheduler.add_job(func, trigger, **kwargs)
+        self._ids().add(job.id)
         logger.info(f"Added job '{job.id}' with trigger '{trigger}'")
         return job
 
@@ -136,6 +180,7 @@ class Scheduler:
             return
 
         self.scheduler.remove_job(job_id)
+        self._ids().discard(job_id)
         logger.info(f"Removed job '{job_id}'")
 
     @log_exceptions
@@ -161,7 +206,7 @@ class Scheduler:
             bool: True if the job exists, False otherwise.
         """
         self._ensure_started()
-        return self.scheduler.get_job(job_id) is not None
+        return job_id in self._ids()
 
     @log_exceptions
     def update_job(self, job_id: str, **changes) -> Job:
@@ -1,5 +1,6 @@
+import asyncio
+
 from fastcore.db.engine import SessionLocal
-from fastcore.errors.exceptions import NotFoundError
 from fastcore.logging.manager import ensure_logger
 
 from app.clients.market_data_client import MarketDataClient
@@ -22,20 +23,29 @@ async def create_market_indices():
     async with SessionLocal() as session:
         service: InstrumentService = InstrumentService(session)
 
-        for symbol in INDEX_SYMBOLS:
-            try:
-                # Try to get existing index
-                await service.get_by_symbol(symbol)
-                logger.info(f"Index '{index_data.symbol}' already exists.")
-            except NotFoundError:
-                # Create if not exists
-                latest_data = MarketDataClient.get_latest_market_data(symbol)
+        # One SELECT for all symbols instead of a get_by_symbol per symbol
+        existing = await service.get_by_symbols(INDEX_SYMBOLS)
+        for symbol in existing:
+            logger.info(f"Index '{symbol}' already exists.")
+
+        missing = [s for s in INDEX_SYMBOLS if s not in existing]
+        if not missing:
+            return
+
+        # yfinance is sync; fan the fetches out to threads in parallel
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(MarketDataClient.get_latest_market_data, symbol)
+                for symbol in missing
+            )
+        )
 
-                if not latest_data:
-                    logger.warning(f"No market data for {symbol}")
-                    continue
+        for symbol, latest_data in zip(missing, results):
+            if not latest_data:
+                logger.warning(f"No market data for {symbol}")
+                continue
 
-                index_data = InstrumentCreate(**latest_data)
+            index_data = InstrumentCreate(**latest_data)
 
-                await service.create(index_data)
-                logger.info(f"Created index '{index_data.symbol}'.")
+            await service.create(index_data)
+            logger.info(f"Created index '{index_data.symbol}'.")
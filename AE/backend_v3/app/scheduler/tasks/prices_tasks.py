@@ -2,7 +2,6 @@ import asyncio
 from typing import List
 
 from fastcore.db.engine import SessionLocal
-from fastcore.errors.exceptions import NotFoundError
 from fastcore.logging.manager import ensure_logger
 
 from app.clients.market_data_client import MarketDataClient
@@ -20,63 +19,85 @@ from app.modules.instruments.service import (
 logger = ensure_logger(None, __name__)
 
 MAX_CONCURRENT = 10
-CHUNK_SIZE = 500
 
 
-def chunked(iterable, size):
-    for i in range(0, len(iterable), size):
-        yield iterable[i : i + size]
-
-
-async def process_instrument(instrument: InstrumentResponse) -> None:
+async def process_instrument(
+    service: InstrumentPriceHistoryService, instrument: InstrumentResponse
+) -> None:
     """
     Fetch and upsert the latest price history for a single instrument.
-    If the price record for the current timestamp does not exist, it is created.
-    Handles NotFoundError for missing records and logs all actions and errors.
+    A single INSERT ... ON CONFLICT DO NOTHING both checks for and creates
+    the record for the current timestamp. Errors propagate to the caller,
+    which owns the session and its rollback.
     Args:
+        service (InstrumentPriceHistoryService): Service bound to the worker's session.
         instrument (InstrumentResponse): The instrument to process.
     """
-    async with SessionLocal() as session:
-        service: InstrumentPriceHistoryService = InstrumentPriceHistoryService(session)
-
-        try:
-            data = await asyncio.to_thread(
-                MarketDataClient.get_latest_market_data,
-                symbol=instrument.symbol,
-                period="7d",
-            )
-
-            if not data:
-                logger.warning(f"No market data for {instrument.symbol}")
-                return
-
-            current_timestamp = data["market_timestamp"]
+    data = await asyncio.to_thread(
+        MarketDataClient.get_latest_market_data,
+        symbol=instrument.symbol,
+        period="7d",
+    )
 
-            existing_record = await service.get(instrument.id, current_timestamp)
+    if not data:
+        logger.warning(f"No market data for {instrument.symbol}")
+        return
 
-            if existing_record:
-                logger.info(
-                    f"Price record already exists for {instrument.symbol} at {current_timestamp}, skipping"
-                )
-                return
+    price_history = InstrumentPriceHistoryCreate.from_raw_data(
+        instrument_id=instrument.id,
+        data=data,
+    )
 
-        except NotFoundError:
-            price_history = InstrumentPriceHistoryCreate.from_raw_data(
-                instrument_id=instrument.id,
-                data=data,
-            )
+    inserted = await service.upsert_if_absent(price_history)
+    if inserted:
+        logger.info(f"Updated price for {instrument.symbol}: {data['price']}")
+    else:
+        logger.info(
+            f"Price record already exists for {instrument.symbol} "
+            f"at {data['market_timestamp']}, skipping"
+        )
 
-            await service.create(price_history)
-            logger.info(f"Updated price for {instrument.symbol}: {data['price']}")
 
-        except Exception as e:
-            logger.error(f"Error updating price for {instrument.symbol}: {str(e)}")
+async def _run_workers(instruments: List[InstrumentResponse], handler) -> None:
+    """
+    Feed instruments through a queue to MAX_CONCURRENT workers, each owning
+    one session for its whole run. Connection acquisitions drop from one per
+    instrument to one per worker.
+    Args:
+        instruments (list[InstrumentResponse]): The instruments to process.
+        handler: Coroutine called as handler(service, instrument) per item.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    for instrument in instruments:
+        queue.put_nowait(instrument)
+    # one sentinel per worker signals the end of the queue
+    for _ in range(MAX_CONCURRENT):
+        queue.put_nowait(None)
+
+    async def worker():
+        async with SessionLocal() as session:
+            service = InstrumentPriceHistoryService(session)
+            while True:
+                instrument = await queue.get()
+                if instrument is None:
+                    break
+                try:
+                    await handler(service, instrument)
+                except Exception as e:
+                    logger.error(
+                        f"Error processing {instrument.symbol}: {str(e)}"
+                    )
+                    # A failed statement aborts the shared session's
+                    # transaction; roll back so the next item can proceed.
+                    await session.rollback()
+
+    await asyncio.gather(*(worker() for _ in range(MAX_CONCURRENT)))
 
 
 async def update_instrument_prices(filters=None) -> None:
     """
     Update the latest price history for all instruments matching the given filters.
-    Processes instruments in parallel with a concurrency limit.
+    Processes instruments with a pool of queue-fed workers.
     Args:
         filters (dict, optional): Filtering criteria for instruments (e.g., type).
     """
@@ -86,54 +107,48 @@ async def update_instrument_prices(filters=None) -> None:
         instruments: List[InstrumentResponse] = await service.list(filters)
         logger.info(f"Found {len(instruments)} instruments to update")
 
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT)
-
-        async def sem_task(inst):
-            async with semaphore:
-                await process_instrument(inst)
-
-        await asyncio.gather(*(sem_task(inst) for inst in instruments))
+    await _run_workers(instruments, process_instrument)
 
 
 async def process_backfill(
-    instrument: InstrumentResponse, period="5y", interval="1d"
+    service: InstrumentPriceHistoryService,
+    instrument: InstrumentResponse,
+    period="5y",
+    interval="1d",
 ) -> None:
     """
     Fetch and upsert historical price history for a single instrument.
-    Uses chunking for bulk inserts. Logs all actions and errors.
+    Inserts the whole history in one service call. Errors propagate to the
+    caller, which owns the session and its rollback.
     Args:
+        service (InstrumentPriceHistoryService): Service bound to the worker's session.
         instrument (InstrumentResponse): The instrument to process.
         period (str): The period for historical data (default: "5y").
         interval (str): The interval for historical data (default: "1d").
     """
-    async with SessionLocal() as session:
-        service: InstrumentPriceHistoryService = InstrumentPriceHistoryService(session)
-
-        try:
-            history = await asyncio.to_thread(
-                MarketDataClient.get_historical_data,
-                instrument.symbol,
-                period,
-                interval,
-            )
-
-            if not history:
-                logger.warning(f"No historical data for {instrument.symbol}")
-                return
-
-            history_to_insert = [
-                InstrumentPriceHistoryCreate.from_raw_data(
-                    instrument_id=instrument.id, data=data
-                )
-                for data in history
-            ]
-
-            for chunk in chunked(history_to_insert, CHUNK_SIZE):
-                await service.bulk_insert(chunk)
-                logger.info(f"Inserted {len(chunk)} records for {instrument.symbol}")
+    history = await asyncio.to_thread(
+        MarketDataClient.get_historical_data,
+        instrument.symbol,
+        period,
+        interval,
+    )
 
-        except Exception as e:
-            logger.error(f"Error backfilling {instrument.symbol}: {str(e)}")
+    if not history:
+        logger.warning(f"No historical data for {instrument.symbol}")
+        return
+
+    history_to_insert = [
+        InstrumentPriceHistoryCreate.from_raw_data(
+            instrument_id=instrument.id, data=data
+        )
+        for data in history
+    ]
+
+    # The service batches (or COPYs) internally; one call, one commit.
+    await service.bulk_insert(history_to_insert)
+    logger.info(
+        f"Inserted {len(history_to_insert)} records for {instrument.symbol}"
+    )
 
 
 async def backfill_instrument_price_history(
@@ -141,7 +156,7 @@ async def backfill_instrument_price_history(
 ) -> None:
     """
     Backfill historical price history for all instruments matching the given filters.
-    Processes instruments in parallel with a concurrency limit and uses chunking for bulk inserts.
+    Processes instruments with a pool of queue-fed workers.
     Args:
         filters (dict, optional): Filtering criteria for instruments (e.g., type).
         period (str): The period for historical data (default: "5y").
@@ -153,13 +168,10 @@ async def backfill_instrument_price_history(
         instruments: List[InstrumentResponse] = await service.list(filters)
         logger.info(f"Backfilling historical data for {len(instruments)} instruments")
 
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT)
-
-        async def sem_task(inst):
-            async with semaphore:
-                await process_backfill(inst, period, interval)
+    async def handler(svc, instrument):
+        await process_backfill(svc, instrument, period, interval)
 
-        await asyncio.gather(*(sem_task(inst) for inst in instruments))
+    await _run_workers(instruments, handler)
 
 
 async def update_index_prices() -> None:
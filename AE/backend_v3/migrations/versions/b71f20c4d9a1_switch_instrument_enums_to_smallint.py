@@ -0,0 +1,67 @@
+"""switch instrument type/market enums to smallint codes
+
+Revision ID: b71f20c4d9a1
+Revises: e8c94ea0ef00
+Create Date: 2025-05-20 09:12:41.873204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b71f20c4d9a1"
+down_revision: Union[str, None] = "e8c94ea0ef00"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Codes follow enum declaration order (see models.EnumSmallInteger).
+INSTRUMENT_TYPE_CODES = ["STOCK", "ETF", "CRYPTO", "INDEX", "FOREX", "OTHER"]
+MARKET_TYPE_CODES = ["NASDAQ", "NYSE", "BIST", "CRYPTO", "FOREX", "OTHER"]
+
+
+def _case_to_code(column: str, names: list) -> str:
+    whens = " ".join(
+        f"WHEN '{name}' THEN {code}" for code, name in enumerate(names)
+    )
+    return f"CASE {column}::text {whens} END"
+
+
+def _case_to_name(column: str, names: list) -> str:
+    whens = " ".join(
+        f"WHEN {code} THEN '{name}'" for code, name in enumerate(names)
+    )
+    return f"CASE {column} {whens} END"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "ALTER TABLE instruments ALTER COLUMN type TYPE smallint USING "
+        + _case_to_code("type", INSTRUMENT_TYPE_CODES)
+    )
+    op.execute(
+        "ALTER TABLE instruments ALTER COLUMN market TYPE smallint USING "
+        + _case_to_code("market", MARKET_TYPE_CODES)
+    )
+    op.execute("DROP TYPE instrumenttype")
+    op.execute("DROP TYPE markettype")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    instrumenttype = ", ".join(f"'{name}'" for name in INSTRUMENT_TYPE_CODES)
+    markettype = ", ".join(f"'{name}'" for name in MARKET_TYPE_CODES)
+    op.execute(f"CREATE TYPE instrumenttype AS ENUM ({instrumenttype})")
+    op.execute(f"CREATE TYPE markettype AS ENUM ({markettype})")
+    op.execute(
+        "ALTER TABLE instruments ALTER COLUMN type TYPE instrumenttype USING ("
+        + _case_to_name("type", INSTRUMENT_TYPE_CODES)
+        + ")::instrumenttype"
+    )
+    op.execute(
+        "ALTER TABLE instruments ALTER COLUMN market TYPE markettype USING ("
+        + _case_to_name("market", MARKET_TYPE_CODES)
+        + ")::markettype"
+    )
@@ -0,0 +1,47 @@
+"""replace price history index with descending composite
+
+Revision ID: c4f8a2d61e37
+Revises: b71f20c4d9a1
+Create Date: 2025-05-21 10:37:18.442916
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4f8a2d61e37"
+down_revision: Union[str, None] = "b71f20c4d9a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "idx_price_history_instrument_ts_desc",
+        "instrument_price_history",
+        ["instrument_id", sa.text("market_timestamp DESC")],
+        unique=False,
+    )
+    # The old (market_timestamp, instrument_id) B-tree serves no remaining
+    # query once the composite above exists; dropping it removes index
+    # maintenance cost from every price insert/upsert.
+    op.drop_index(
+        "idx_price_history_ts_instrument", table_name="instrument_price_history"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "idx_price_history_ts_instrument",
+        "instrument_price_history",
+        ["market_timestamp", "instrument_id"],
+        unique=False,
+    )
+    op.drop_index(
+        "idx_price_history_instrument_ts_desc",
+        table_name="instrument_price_history",
+    )
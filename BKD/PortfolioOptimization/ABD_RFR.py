@@ -1,35 +1,76 @@
-import requests
 import calendar
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 api_key = '142dca7d8e41dbab0356ecf347dcd5d0'
 base_url = f'https://api.stlouisfed.org/fred/series/observations?series_id=TB3MS&api_key={api_key}&file_type=json&'
 
+# Pooled session with retry/backoff: FRED calls reuse one keep-alive
+# connection instead of a fresh handshake per (year, month) lookup.
+_session = requests.Session()
+_session.mount(
+    'https://',
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.5),
+    ),
+)
+
 def get_last_day_of_month(year, month):
     """Belirtilen yıl ve ay için son günü döndürür."""
     last_day = calendar.monthrange(year, month)[1]
     return last_day
 
-# This function returns the risk free rate for ABD stock markets
-def get_tb3ms_value(year, month):
-    """Belirtilen yıl ve ay için TB3MS değerini alır."""
+# Historical TB3MS values are immutable for past months, so the cache
+# answers repeat (year, month) queries without touching the network.
+# Failures raise instead of returning, so lru_cache never memoizes a
+# transient network error or a month FRED has not published yet.
+@lru_cache(maxsize=4096)
+def _fetch_tb3ms(year, month):
     start_date = f'{year}-{month:02d}-01'
     end_date = f'{year}-{month:02d}-{get_last_day_of_month(year, month)}'
-    
+
     url = f'{base_url}observation_start={start_date}&observation_end={end_date}'
-    
+
+    response = _session.get(url, timeout=5)
+    response.raise_for_status()  # HTTP hata kodlarını kontrol et
+    data = response.json()
+
+    # Verileri kontrol et ve değeri döndür
+    observations = data.get('observations', [])
+    if not observations:
+        raise LookupError(f'No TB3MS observation for {start_date}')
+    # Son gözlemi al
+    return observations[-1].get('value', 'No data')
+
+# This function returns the risk free rate for ABD stock markets.
+def get_tb3ms_value(year, month):
+    """Belirtilen yıl ve ay için TB3MS değerini alır."""
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # HTTP hata kodlarını kontrol et
-        data = response.json()
-        
-        # Verileri kontrol et ve değeri döndür
-        observations = data.get('observations', [])
-        if observations:
-            # Son gözlemi al
-            last_observation = observations[-1]
-            value = last_observation.get('value', 'No data')
-            return value
-        else:
-            return None
+        return _fetch_tb3ms(year, month)
+    except LookupError:
+        return None
     except requests.exceptions.RequestException as e:
-        return f'An error occurred: {e}'
\ No newline at end of file
+        return f'An error occurred: {e}'
+
+# Ranged variant: one request covers every month in [start_year, end_year],
+# so callers that need many (year, month) pairs avoid a round-trip each.
+def get_tb3ms_range(start_year, end_year):
+    """Belirtilen yıl aralığı için tüm TB3MS değerlerini tek istekte alır."""
+    url = f'{base_url}observation_start={start_year}-01-01&observation_end={end_year}-12-31'
+
+    try:
+        response = _session.get(url, timeout=10)
+        response.raise_for_status()
+        observations = response.json().get('observations', [])
+        return {
+            (int(o['date'][:4]), int(o['date'][5:7])): float(o['value'])
+            for o in observations
+            if o.get('value') not in (None, '.')
+        }
+    except requests.exceptions.RequestException:
+        return {}
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import threading
+from functools import lru_cache
+
+import pandas as pd
+import yfinance as yf
+
+# Ortak yfinance indirme cache'i: aynı (hisseler, start, end) sorgusu önce
+# bellekteki lru_cache'ten, sonra diskteki parquet dosyasından karşılanır;
+# ağ yalnızca ilk seferde kullanılır.
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'hsytp')
+
+# İndirilen tam frameler burada da tutulur: yeni bir sorgu, daha önce
+# indirilmiş ve ticker kümesi ile tarih aralığı onu kapsayan bir frame'den
+# dilimlenerek ağa hiç çıkmadan karşılanabilir (train sonrası evaluate gibi
+# örtüşen pencereler için).
+_RESIDENT_MAX = 32
+_resident = {}  # (tickers, start, end) -> DataFrame
+# threaded sunucuda eşzamanlı istekler kayıt defterini aynı anda okuyup
+# yazabilir; kilit "dictionary changed size during iteration" hatasını önler
+_resident_lock = threading.Lock()
+
+
+def _slice_from_resident(tickers, start, end):
+    wanted = set(tickers)
+    with _resident_lock:
+        entries = list(_resident.items())
+    for (r_tickers, r_start, r_end), frame in entries:
+        if wanted <= set(r_tickers) and r_start <= start and end <= r_end:
+            # yf.download'un end'i hariçtir; .loc dilimi ise dahil ederdi —
+            # searchsorted ile aynı hariç sınır korunur ki kapsayan frame'den
+            # dilimlenen sonuç taze indirmeyle birebir aynı olsun
+            i0 = frame.index.searchsorted(start)
+            i1 = frame.index.searchsorted(end)
+            sliced = frame.iloc[i0:i1][list(tickers)]
+            if not sliced.empty:
+                return sliced
+    return None
+
+
+def _register_resident(tickers, start, end, frame):
+    with _resident_lock:
+        if len(_resident) >= _RESIDENT_MAX:
+            _resident.pop(next(iter(_resident)))
+        _resident[(tickers, start, end)] = frame
+
+
+def _cache_path(tickers, start, end):
+    key = f"{','.join(tickers)}|{start}|{end}"
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f'{digest}.parquet')
+
+
+@lru_cache(maxsize=1024)
+def _download_cached(tickers, start, end):
+    """Kanonik (sıralı) ticker tuple'ı için Close matrisini döndürür."""
+    path = _cache_path(tickers, start, end)
+    if os.path.exists(path):
+        try:
+            return pd.read_parquet(path, engine='pyarrow')
+        except Exception:
+            pass  # bozuk cache dosyası: yeniden indir
+
+    data = yf.download(
+        list(tickers), start=start, end=end, threads=True, progress=False
+    )['Close']
+    if isinstance(data, pd.Series):
+        data = data.to_frame(name=tickers[0])
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        data.to_parquet(path, engine='pyarrow')
+    except Exception:
+        pass  # disk yazılamazsa yalnızca bellek cache'i kullanılır
+    return data
+
+
+def download_close(tickers, start, end):
+    """
+    Close fiyatlarını indirir (str veya liste kabul eder). Cache'teki frame
+    paylaşıldığı için çağırana her zaman bir kopya verilir.
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    key = (tuple(sorted(tickers)), str(start), str(end))
+
+    covering = _slice_from_resident(*key)
+    if covering is not None:
+        return covering.copy()
+
+    frame = _download_cached(*key)
+    _register_resident(*key, frame)
+    return frame.copy()
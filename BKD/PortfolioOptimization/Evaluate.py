@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import yfinance as yf
+from DataCache import download_close
 
 
 class Evaluate:
@@ -17,10 +17,10 @@ class Evaluate:
             self.index_name = 'XU100.IS'
 
     def createDataset(self, stocks, start, end):
-        stockData = yf.download(stocks, start=start, end=end)['Close']
-        if stockData.isna().sum().sum() > 0:
-            stockData.fillna(method='ffill', inplace=True)
-            stockData.dropna(axis=1, inplace=True)  # NaN içeren sütunları çıkar
+        stockData = download_close(stocks, start, end)
+        # ffill NaN yokken no-op olduğundan ön kontrol gereksiz;
+        # fillna(method=...) pandas 2.x'te deprecated
+        stockData = stockData.ffill().dropna(axis=1)
         return stockData
     
     def percentOfGain(self, x1, x2):
@@ -49,21 +49,22 @@ class Evaluate:
         result['index'] = self.index_name
         result['stock-market-gain(%)'] = np.round(stock_market_gain_percentage,2)
         result['portfolio-gain(%)'] = np.round(self.percentOfGain(budget, final_budget),2)
-        result['detail'] = {}
-        
         cost = amounts * portfolio_prices.iloc[0]
         final = amounts * portfolio_prices.iloc[-1]
         kar = final - cost
 
-        for m, i, j, k, l in zip(buyStocks, amounts, cost, final, kar):
-            if i > 0:
-                result['detail'][m] = {
-                    'amount': np.round(i,2),
-                    'cost' : np.round(j,2),
-                    'final' : np.round(k,2),
-                    'gain': np.round(l,2)
-                }
-            else: continue
+        # Yuvarlama eleman eleman değil vektör üzerinde bir kez yapılır
+        amt_r = np.round(amounts, 2)
+        cost_r = np.round(cost, 2)
+        fin_r = np.round(final, 2)
+        kar_r = np.round(kar, 2)
+        mask = amounts > 0
+
+        result['detail'] = {
+            m: {'amount': a, 'cost': c, 'final': f, 'gain': g}
+            for m, a, c, f, g, ok in zip(buyStocks, amt_r, cost_r, fin_r, kar_r, mask)
+            if ok
+        }
         return result
 
 
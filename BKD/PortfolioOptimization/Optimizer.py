@@ -1,13 +1,42 @@
 import numpy as np
 from scipy.optimize import linprog
-from scipy.optimize import minimize
+from scipy.optimize import minimize, Bounds, LinearConstraint
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; NumPy fallback is used without it
+    njit = None
+
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def _mc_sharpe_kernel(N, mu, cov, rf):
+        # Fuses sampling, normalization, scoring and the running argmax
+        # into one pass: no (N, D) intermediates, no Python dispatch.
+        D = mu.shape[0]
+        best_sr = -1e300
+        best_w = np.empty(D)
+        for _ in range(N):
+            w = np.random.random(D)
+            w /= w.sum()
+            ret = w @ mu
+            risk = np.sqrt(w @ cov @ w)
+            sr = -(ret - rf) / risk
+            if sr > best_sr:
+                best_sr = sr
+                best_w = w.copy()
+        return best_w
+else:
+    _mc_sharpe_kernel = None
+
 
 class Optimizer:
     def __init__(self, mean_return, cov):
         ### NOTE: The bounds are by default (0, None) unless otherwise specified.
         # bounds = None, bounds = [(-0.5, None)]*D, bounds = [(0, None)]*D
-        self.mean_return = mean_return
-        self.cov = cov
+        # Convert once: keeps the optimizers on plain float64 ndarrays
+        # instead of paying pandas indexing overhead per objective call.
+        self.mean_return = np.ascontiguousarray(mean_return, dtype=np.float64)
+        self.cov = np.ascontiguousarray(cov, dtype=np.float64)
         self.D = len(self.mean_return)
         self.bounds = [(0, 1)] * self.D
 
@@ -15,63 +44,95 @@ class Optimizer:
         # return weights[0].dot(weights[1]).dot(weights[0])
         return weights.dot(self.cov).dot(weights)
 
+    def __get_variance_grad(self, weights):
+        # ∇(wᵀΣw) = 2Σw — one gemv instead of D finite-difference evals
+        return 2 * self.cov @ weights
+
     def __target_return_constraint(self, weights, target):
         return weights.dot(self.mean_return) - target
 
     def __portfolio_constraint(self, weights):
         return weights.sum() - 1
 
+    def __portfolio_constraint_jac(self, weights):
+        return np.ones(self.D)
+
     def neg_get_sharpe_ratio(self, weights):
         ret = weights.dot(self.mean_return)
         risk = np.sqrt(weights.dot(self.cov).dot(weights))
         return -(ret - self.risk_free_rate) / risk
 
+    def neg_get_sharpe_ratio_grad(self, weights):
+        # ∇(-(μᵀw - r_f)/σ) = -μ/σ + (μᵀw - r_f)·Σw/σ³ with σ = sqrt(wᵀΣw)
+        cov_w = self.cov @ weights
+        risk = np.sqrt(weights @ cov_w)
+        excess = weights @ self.mean_return - self.risk_free_rate
+        return -self.mean_return / risk + excess * cov_w / risk**3
+
     def min_variance_optimizer(self):
+        # The problem is a convex QP (quadratic objective, one linear
+        # equality, box bounds): trust-constr with the exact constant
+        # Hessian 2*cov converges to the global optimum regardless of x0,
+        # unlike SLSQP which could stall in a local solution.
         res = minimize(
             fun=self.__get_portfolio_variance,
-            # x0=[np.ones(D) / D, cov], # uniform
+            jac=self.__get_variance_grad,
+            hess=lambda w: 2 * self.cov,
             x0=np.ones(self.D) / self.D, # uniform
-            method='SLSQP',
-            constraints={
-                'type': 'eq',
-                'fun': self.__portfolio_constraint,
-            },
-            bounds=self.bounds
+            method='trust-constr',
+            constraints=LinearConstraint(np.ones(self.D), 1, 1),
+            bounds=Bounds(0, 1)
         )
         # mv_risk = np.sqrt(res.fun)
         mv_weights = res.x
         # mv_ret = mv_weights.dot(self.mean_return)
         return mv_weights
     
-    def sharpe_ratio_optimizer(self, risk_free_rate):
+    def sharpe_ratio_optimizer(self, risk_free_rate, n_starts = 8):
         self.risk_free_rate = risk_free_rate
-        res = minimize(
-            fun=self.neg_get_sharpe_ratio,
-            x0=np.ones(self.D) / self.D, # uniform
-            method='SLSQP',
-            constraints={
-                'type': 'eq',
-                'fun': self.__portfolio_constraint,
-            },
-            bounds=self.bounds
-        )
-        # mv_risk = np.sqrt(-res.fun)
-        sr_weights = res.x
+        # The Sharpe objective is non-convex, so a single SLSQP run from
+        # the uniform x0 can converge to a local optimum. Restart from
+        # several random feasible points (plus the min-variance solution)
+        # and keep the best; each run is cheap thanks to analytic jacs.
+        starts = [
+            np.ones(self.D) / self.D, # uniform
+            self.min_variance_optimizer(),
+        ]
+        starts.extend(np.random.dirichlet(np.ones(self.D), size=n_starts))
+
+        best = None
+        for x0 in starts:
+            res = minimize(
+                fun=self.neg_get_sharpe_ratio,
+                jac=self.neg_get_sharpe_ratio_grad,
+                x0=x0,
+                method='SLSQP',
+                constraints={
+                    'type': 'eq',
+                    'fun': self.__portfolio_constraint,
+                    'jac': self.__portfolio_constraint_jac,
+                },
+                bounds=self.bounds
+            )
+            if best is None or res.fun < best.fun:
+                best = res
+        # mv_risk = np.sqrt(-best.fun)
+        sr_weights = best.x
         # mv_ret = mv_weights.dot(self.mean_return)
         return sr_weights
     
     def monte_carlo_optimizer(self, N = 10000, risk_free_rate = 10):
         self.risk_free_rate = risk_free_rate
-        mc_best_w = None
-        mc_best_sr = float('-inf')
-        for _ in range(N):
-            w = np.random.random(self.D)
-            w = w / w.sum()
-            sr = self.neg_get_sharpe_ratio(w)
-            if sr > mc_best_sr:
-                mc_best_sr = sr
-                mc_best_w = w
+        if _mc_sharpe_kernel is not None:
+            return _mc_sharpe_kernel(N, self.mean_return, self.cov,
+                                     float(risk_free_rate))
+        # Sample the whole (N, D) weight matrix at once and score every
+        # candidate in a few BLAS/einsum passes instead of N Python trips.
+        W = np.random.random((N, self.D))
+        W /= W.sum(axis=1, keepdims=True)
+        rets = W @ self.mean_return
+        risks = np.sqrt(np.einsum('ni,ij,nj->n', W, self.cov, W))
+        sr = -(rets - self.risk_free_rate) / risks
         # mv_risk = np.sqrt(mc_best_sr)
         # mv_ret = mv_weights.dot(self.mean_return)
-        return mc_best_w
-    
\ No newline at end of file
+        return W[np.argmax(sr)]
@@ -1,14 +1,65 @@
+import json
+import os
+import tempfile
+
 import pandas as pd
 # from pandas_datareader import data as pdr
 import numpy as np
 from datetime import datetime, timedelta
 import yfinance as yf
 
+from DataCache import CACHE_DIR, download_close
+
 
 from Optimizer import Optimizer
 from ABD_RFR import get_tb3ms_value
 from ABC import ABC_Model
 
+# Wikipedia hisse listesi en fazla üç ayda bir değişir; her istek başına
+# ~200 ms'lik ağ + HTML parse maliyetini ödememek için liste 7 gün süreyle
+# diskte ve bellekte tutulur. TTL her iki katman için de geçerlidir, bu
+# yüzden uzun yaşayan gunicorn worker'ları da 7 günde bir tazeler;
+# başarısız (boş) sonuçlar hiç cache'lenmez.
+_TICKER_TTL_SECONDS = 7 * 24 * 3600
+_ticker_cache = {}  # market -> (timestamp, stocks)
+
+
+def _get_ticker_list(market, url, column, suffix=''):
+    now = datetime.now().timestamp()
+
+    hit = _ticker_cache.get(market)
+    if hit is not None and now - hit[0] <= _TICKER_TTL_SECONDS:
+        return hit[1]
+
+    path = os.path.join(CACHE_DIR, f'tickers_{market}.json')
+    try:
+        if os.path.getmtime(path) > now - _TICKER_TTL_SECONDS:
+            with open(path) as fh:
+                stocks = json.load(fh)
+            _ticker_cache[market] = (now, stocks)
+            return stocks
+    except OSError:
+        pass  # cache yok ya da okunamadı: yeniden indir
+
+    tables = pd.read_html(url)
+    stocks = None
+    for table in tables:
+        if column in table.columns:
+            stocks = (table[column] + suffix).tolist() if suffix else table[column].tolist()
+            break
+    if stocks:
+        _ticker_cache[market] = (now, stocks)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            # Atomik yazma: yarım kalmış dosya cache'i bozmasın
+            fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix='.json')
+            with os.fdopen(fd, 'w') as fh:
+                json.dump(stocks, fh)
+            os.replace(tmp, path)
+        except OSError:
+            pass  # disk yazılamazsa yalnızca bellek cache'i kullanılır
+    return stocks
+
 class Portfolio:
 
     def __init__(self, stock_market) -> None:
@@ -18,12 +69,7 @@ class Portfolio:
         try:
             if stock_market.lower() in ['nasdaq', 'nasdaq100', 'nasdaq-100']:
                 url = 'https://en.wikipedia.org/wiki/Nasdaq-100'
-                tables = pd.read_html(url)
-                # Doğru tabloyu kontrol et
-                for table in tables:
-                    if 'Symbol' in table.columns:
-                        self.stocks = table['Symbol'].tolist()
-                        break
+                self.stocks = _get_ticker_list('NASDAQ100', url, 'Symbol')
                 if self.stocks:
                     print("NASDAQ-100 Hisse Sembolleri:")
                     print(self.stocks)
@@ -35,11 +81,7 @@ class Portfolio:
 
             elif stock_market.lower() in ['bist100', 'bist-100', 'bist']:
                 url = 'https://tr.wikipedia.org/wiki/Borsa_%C4%B0stanbul%27da_i%C5%9Flem_g%C3%B6ren_%C5%9Firketler_listesi'
-                tables = pd.read_html(url)
-                for table in tables:
-                    if 'Kod' in table.columns:
-                        self.stocks = (table['Kod'] + '.IS').tolist()
-                        break
+                self.stocks = _get_ticker_list('BIST100', url, 'Kod', suffix='.IS')
                 if self.stocks:
                     print("BIST 100 Hisse Sembolleri:")
                     print(self.stocks)
@@ -56,10 +98,10 @@ class Portfolio:
 
     def createDataset(self, stocks, start, end):
         # end = start + timedelta(days=days)
-        stockData = yf.download(stocks, start=start, end=end)['Close']
-        if stockData.isna().sum().sum() > 0:
-            stockData.fillna(method='ffill', inplace=True)
-            stockData.dropna(axis=1, inplace=True)  # NaN içeren sütunları çıkar
+        stockData = download_close(stocks, start, end)
+        # ffill NaN yokken no-op olduğundan ön kontrol gereksiz;
+        # fillna(method=...) pandas 2.x'te deprecated
+        stockData = stockData.ffill().dropna(axis=1)
         return stockData
 
     def get_previous_dates(self, date, train_days):
@@ -76,20 +118,33 @@ class Portfolio:
             rfr = 50.0 / 252
         return rfr
 
-    def trainPortfolio(self, date, train_days, opt_type, numberOfStock, evaNum=None, limit=None, P=None, MR=None, fitnessFun=None):
+    def trainPortfolio(self, date, train_days, opt_type, numberOfStock, evaNum=None, limit=None, P=None, MR=None, fitnessFun=None, cov_method='sample'):
         # dates = all_dates[start : end]
         start_date, end_date = self.get_previous_dates(date, train_days)
         prices = self.createDataset(self.stocks, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
-        dates = prices.index.unique().sort_values()
-        returns = pd.DataFrame(index=dates[1:])
-        stocks = prices.columns
-        # print(stocks)
-        for stock in stocks:
-            current_returns = prices[stock].pct_change()
-            returns[stock] = current_returns.iloc[1:] * 100
-
-        mean_return = returns.mean()
-        cov = returns.cov()
+        stocks = prices.columns.to_numpy()
+
+        # Getiriler hisse hisse pct_change yerine tek matris işlemiyle:
+        # per-sütun Series ayırmadan, pandas hizalaması olmadan
+        P_mat = prices.to_numpy(dtype=np.float64)
+        R = np.empty((P_mat.shape[0] - 1, P_mat.shape[1]))
+        np.divide(P_mat[1:], P_mat[:-1], out=R)
+        R -= 1.0
+        R *= 100
+
+        mean_return = R.mean(axis=0)
+
+        # Örnek kovaryans D~100 hisse ve ~120 günlük getiriyle kötü
+        # koşullanmış olur; shrinkage hem optimizasyonu kararlı kılar hem
+        # de SLSQP'nin daha az iterasyonda yakınsamasını sağlar.
+        if cov_method == 'ledoit_wolf':
+            from sklearn.covariance import LedoitWolf
+            cov = LedoitWolf(store_precision=False).fit(R).covariance_
+        elif cov_method == 'oas':
+            from sklearn.covariance import OAS
+            cov = OAS(store_precision=False).fit(R).covariance_
+        else:
+            cov = np.cov(R, rowvar=False)
 
         opt = Optimizer(mean_return=mean_return, cov=cov)
 
@@ -115,20 +170,29 @@ class Portfolio:
             self.weights = abc.net
             opt_method = 'ABC optimization'
 
-        # En yüksek ağırlığa sahip ilk 10 stoğu seç
-        top_indices = np.argsort(self.weights)[-numberOfStock:]
+        # En yüksek ağırlığa sahip ilk 10 stoğu seç — tam argsort yerine
+        # O(D) argpartition, sıralama yalnızca seçilen k eleman üzerinde.
+        # dropna(axis=1) evreni küçültebildiğinden k eleman sayısına kırpılır
+        k = min(numberOfStock, self.weights.size)
+        if k < self.weights.size:
+            idx = np.argpartition(self.weights, -k)[-k:]
+        else:
+            idx = np.arange(self.weights.size)
+        top_indices = idx[np.argsort(self.weights[idx])]
         self.weights = self.weights[top_indices]
-        self.stocks = np.array(stocks)[top_indices]
+        self.stocks = stocks[top_indices]
 
         # Ağırlıkları normalize et
         self.weights = self.weights / np.sum(self.weights)
 
         result = {}
         # result['opt_method'] = opt_method
-        result['weights'] = {}
-        result['weights(%)'] = {}
-        result['weights'] = {stock: weight for stock, weight in zip(self.stocks, self.weights)}
-        result['weights(%)'] = {stock: np.round(weight * 100, 2) for stock, weight in zip(self.stocks, self.weights) if np.round(weight * 100, 2) != 0}
+        # Yuvarlama vektör üzerinde bir kez, dict'ler tek geçişte; tolist()
+        # numpy skalarlarını toptan Python float'a çevirir
+        stocks_list = self.stocks.tolist()
+        w_pct = np.round(self.weights * 100, 2)
+        result['weights'] = dict(zip(stocks_list, self.weights.tolist()))
+        result['weights(%)'] = {s: p for s, p in zip(stocks_list, w_pct.tolist()) if p != 0.0}
 
         return result
     
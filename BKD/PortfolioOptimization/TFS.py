@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
+from DataCache import download_close
 from datetime import datetime, timedelta
 
 class TrendFollowingStrategy:
@@ -10,11 +10,10 @@ class TrendFollowingStrategy:
         self.df = None
 
     def createDataset(self, stocks, start, end):
-        stockData = yf.download(stocks, start=start, end=end)['Close']
-        if stockData.isna().sum().sum() > 0:
-            print("Eksik veri tespit edildi. Eksik veriler dolduruluyor...")
-            stockData.fillna(method='ffill', inplace=True)
-            stockData.dropna(axis=1, inplace=True) # NaN içeren sütunları çıkar
+        stockData = download_close(stocks, start, end)
+        # ffill NaN yokken no-op olduğundan ön kontrol gereksiz;
+        # fillna(method=...) pandas 2.x'te deprecated
+        stockData = stockData.ffill().dropna(axis=1)
         return stockData
 
     def backtest(self):
@@ -31,35 +30,70 @@ class TrendFollowingStrategy:
             print("Veri çekilemedi. Lütfen tarihleri ve sembolleri kontrol edin.")
             return
 
-        # Her hisse için TFS uygulama
-        for stock in self.portfolio.keys():
-            self.df[f'{stock}_Return'] = self.df[stock].pct_change()
-            self.df[f'{stock}_SlowSMA'] = self.df[stock].rolling(30).mean()
-            self.df[f'{stock}_FastSMA'] = self.df[stock].rolling(10).mean()
-            self.df[f'{stock}_Signal'] = np.where(self.df[f'{stock}_FastSMA'] >= self.df[f'{stock}_SlowSMA'], 1, 0)
-            self.df[f'{stock}_PrevSignal'] = self.df[f'{stock}_Signal'].shift(1)
-            self.df[f'{stock}_Buy'] = (self.df[f'{stock}_PrevSignal'] == 0) & (self.df[f'{stock}_Signal'] == 1)
-            self.df[f'{stock}_Sell'] = (self.df[f'{stock}_PrevSignal'] == 1) & (self.df[f'{stock}_Signal'] == 0)
-
-        # SMA ve sinyaller hesaplandıktan sonra filtreleme
-        self.df = self.df.loc[self.start_date:end]
-
-        # Yatırım durumunu belirleme
-        is_invested = {stock: False for stock in self.portfolio.keys()}
-
-        def assign_is_invested(row, stock):
-            if is_invested[stock] and row[f'{stock}_Sell']:
-                is_invested[stock] = False
-            if not is_invested[stock] and row[f'{stock}_Buy']:
-                is_invested[stock] = True
-            return is_invested[stock]
-
-        for stock in self.portfolio.keys():
-            self.df[f'{stock}_IsInvested'] = self.df.apply(lambda row: assign_is_invested(row, stock), axis=1)
-            self.df[f'{stock}_AlgoReturn'] = self.df[f'{stock}_IsInvested'] * self.df[f'{stock}_Return']
-
-        # Portföy genel getiri hesaplama
-        self.df['PortfolioReturn'] = sum(self.df[f'{stock}_AlgoReturn'] * weight for stock, weight in self.portfolio.items())
+        # TFS özellikleri tüm hisseler için matris bazında hesaplanır ve tek
+        # concat ile eklenir — sütun sütun atama DataFrame bloklarını her
+        # seferinde yeniden kurup parçalanmaya yol açıyor
+        stocks = list(self.portfolio.keys())
+        prices = self.df[stocks]
+        ret = prices.pct_change()
+        slow = prices.rolling(30).mean()
+        fast = prices.rolling(10).mean()
+        sig = (fast >= slow).astype(int)
+        prev = sig.shift(1)
+        buy = (prev == 0) & (sig == 1)
+        sell = (prev == 1) & (sig == 0)
+
+        self.df = pd.concat(
+            [
+                self.df,
+                ret.add_suffix('_Return'),
+                slow.add_suffix('_SlowSMA'),
+                fast.add_suffix('_FastSMA'),
+                sig.add_suffix('_Signal'),
+                prev.add_suffix('_PrevSignal'),
+                buy.add_suffix('_Buy'),
+                sell.add_suffix('_Sell'),
+            ],
+            axis=1,
+            copy=False,
+        )
+
+        # SMA ve sinyaller hesaplandıktan sonra filtreleme — bool maske
+        # yerine searchsorted ile tek tamsayı pivot ve iloc dilimi
+        i0 = self.df.index.searchsorted(pd.Timestamp(self.start_date))
+        self.df = self.df.iloc[i0:]
+
+        # Yatırım durumu ve algoritma getirisi tüm hisseler için tek matris
+        # üzerinde hesaplanır: sütun başına pandas hash lookup'ı yok, Buy 1 /
+        # Sell 0 yazılıp aradaki günler tek DataFrame ffill ile taşınır
+        buy_mat = self.df[[f'{s}_Buy' for s in stocks]].to_numpy(dtype=bool)
+        sell_mat = self.df[[f'{s}_Sell' for s in stocks]].to_numpy(dtype=bool)
+        ret_mat = self.df[[f'{s}_Return' for s in stocks]].to_numpy(dtype=np.float64)
+
+        state = np.full(ret_mat.shape, np.nan)
+        state[buy_mat] = 1.0
+        state[sell_mat] = 0.0
+        invested = (
+            pd.DataFrame(state, index=self.df.index)
+            .ffill()
+            .fillna(0.0)
+            .to_numpy(dtype=bool)
+        )
+        algo = invested * ret_mat
+
+        self.df = pd.concat(
+            [
+                self.df,
+                pd.DataFrame(invested, index=self.df.index, columns=[f'{s}_IsInvested' for s in stocks]),
+                pd.DataFrame(algo, index=self.df.index, columns=[f'{s}_AlgoReturn' for s in stocks]),
+            ],
+            axis=1,
+            copy=False,
+        )
+
+        # Portföy genel getiri hesaplama — S ayrı Series çarpımı yerine tek gemv
+        weights = np.fromiter(self.portfolio.values(), dtype=np.float64)
+        self.df['PortfolioReturn'] = algo @ weights
 
         # Toplam portföy getirisi
         total_return = (1 + self.df['PortfolioReturn']).prod() - 1
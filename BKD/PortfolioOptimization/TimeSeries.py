@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
+from DataCache import download_close
 from datetime import datetime, timedelta
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression
@@ -23,11 +23,10 @@ class TimeSeriesStrategy:
 
     def create_dataset(self, stocks, start, end):
         try:
-            stock_data = yf.download(stocks, start=start, end=end)['Close']
-            if stock_data.isna().sum().sum() > 0:
-                print("Eksik veri tespit edildi. Eksik veriler dolduruluyor...")
-                stock_data.fillna(method='ffill', inplace=True)
-                stock_data.dropna(axis=1, inplace=True)
+            stock_data = download_close(stocks, start, end)
+            # ffill NaN yokken no-op olduğundan ön kontrol gereksiz;
+            # fillna(method=...) pandas 2.x'te deprecated
+            stock_data = stock_data.ffill().dropna(axis=1)
             return stock_data
         except Exception as e:
             print(f"Veri çekme sırasında hata oluştu: {e}")
@@ -47,10 +46,32 @@ class TimeSeriesStrategy:
             print("Veri çekilemedi. Lütfen tarihleri ve sembolleri kontrol edin.")
             return
 
-        for stock in self.portfolio.keys():
-            self.df[f'{stock}_LogPrice'] = np.log(self.df[stock])
-            self.df[f'{stock}_Return'] = self.df[f'{stock}_LogPrice'].diff()
-            self.df[f'{stock}_Prev'] = self.df[f'{stock}_LogPrice'].shift(1)
+        # Log fiyat, getiri ve önceki değer tüm hisseler için tek matris
+        # üzerinde hesaplanır ve tek concat ile eklenir
+        stocks = list(self.portfolio.keys())
+        closes = self.df[stocks].to_numpy(dtype=np.float64)
+        log_prices = np.log(closes)
+        returns = np.empty_like(log_prices)
+        returns[0] = np.nan
+        returns[1:] = log_prices[1:] - log_prices[:-1]
+        prev = np.empty_like(log_prices)
+        prev[0] = np.nan
+        prev[1:] = log_prices[:-1]
+
+        self.df = pd.concat(
+            [
+                self.df,
+                pd.DataFrame(log_prices, index=self.df.index, columns=[f'{s}_LogPrice' for s in stocks]),
+                pd.DataFrame(returns, index=self.df.index, columns=[f'{s}_Return' for s in stocks]),
+                pd.DataFrame(prev, index=self.df.index, columns=[f'{s}_Prev' for s in stocks]),
+            ],
+            axis=1,
+            copy=False,
+        )
+
+        # Test aralığının başlangıcı bir kez searchsorted ile bulunur;
+        # sonraki bütün dilimlemeler bool maske yerine bu pivotu kullanır
+        self._test_start_iloc = self.df.index.searchsorted(pd.Timestamp(self.start_date))
 
     def one_step_forecast(self, stock, X_train, Y_train, X_test):
         self.model.fit(X_train, Y_train)
@@ -58,26 +79,21 @@ class TimeSeriesStrategy:
 
         # train_idx = self.df.index < self.start_date
         # train_idx[:self.T+1] = False # first T values are not predictable
-        test_idx = self.df.index >= self.start_date
+        i0 = self._test_start_iloc
 
         # self.df.loc[train_idx, f'{stock}_1step_train'] = prev[train_idx] + self.model.predict(X_train)
-        self.df.loc[test_idx, f'{stock}_1step_test'] = prev[test_idx] + self.model.predict(X_test)
+        self.df.loc[self.df.index[i0]:, f'{stock}_1step_test'] = prev.iloc[i0:] + self.model.predict(X_test)
 
     def generate_signals(self):
-        Ntest = len(self.df[self.df.index >= self.start_date])
+        Ntest = len(self.df) - self._test_start_iloc
 
         for stock in self.portfolio.keys():
             series = self.df[f'{stock}_Return'].to_numpy()[1:]
-            
-            X = []
-            Y = []
-
-            for t in range(len(series) - self.T):
-                X.append(series[t:t + self.T])
-                Y.append(series[t + self.T])
 
-            X = np.array(X).reshape(-1, self.T)
-            Y = np.array(Y)
+            # Kayan pencereler stride view ile: Python döngüsü ve kopya yok
+            windows = np.lib.stride_tricks.sliding_window_view(series, self.T)
+            X = windows[:-1]
+            Y = series[self.T:]
 
             X_train, Y_train = X[:-Ntest], Y[:-Ntest]
             X_test = X[-Ntest:]
@@ -94,32 +110,44 @@ class TimeSeriesStrategy:
         self.prepare_data()
         self.generate_signals()
 
-        is_invested = {stock: False for stock in self.portfolio. keys()}
-        new_columns = {}
-
-        def assign_is_invested(row, stock):
-            if is_invested[stock]:
-                if row[f'{stock}_Sell']:
-                    is_invested[stock] = False
-            else:
-                if row[f'{stock}_Buy']:
-                    is_invested[stock] = True
-            return is_invested[stock]
-
-        for stock in self.portfolio.keys():
-            new_columns[f'{stock}_IsInvested'] = self.df.apply(lambda row: assign_is_invested(row, stock), axis=1)
-            new_columns[f'{stock}_AlgoReturn'] = new_columns[f'{stock}_IsInvested'] * self.df[f'{stock}_Return']
-
-        # Tüm yeni sütunları bir DataFrame olarak birleştirin
-        new_columns_df = pd.DataFrame(new_columns, index=self.df.index)
+        stocks = list(self.portfolio.keys())
+
+        # Yatırım durumu ve algoritma getirisi tüm hisseler için tek matris
+        # üzerinde: sütun başına pandas hash lookup'ı yok, Buy 1 / Sell 0
+        # yazılıp aradaki günler tek DataFrame ffill ile taşınır
+        buy_mat = self.df[[f'{s}_Buy' for s in stocks]].to_numpy(dtype=bool)
+        sell_mat = self.df[[f'{s}_Sell' for s in stocks]].to_numpy(dtype=bool)
+        ret_mat = self.df[[f'{s}_Return' for s in stocks]].to_numpy(dtype=np.float64)
+
+        state = np.full(ret_mat.shape, np.nan)
+        state[buy_mat] = 1.0
+        state[sell_mat] = 0.0
+        invested = (
+            pd.DataFrame(state, index=self.df.index)
+            .ffill()
+            .fillna(0.0)
+            .to_numpy(dtype=bool)
+        )
+        algo = invested * ret_mat
 
         # Orijinal DataFrame ile yeni sütunları tek seferde birleştirin
-        self.df = pd.concat([self.df, new_columns_df], axis=1)
+        self.df = pd.concat(
+            [
+                self.df,
+                pd.DataFrame(invested, index=self.df.index, columns=[f'{s}_IsInvested' for s in stocks]),
+                pd.DataFrame(algo, index=self.df.index, columns=[f'{s}_AlgoReturn' for s in stocks]),
+            ],
+            axis=1,
+            copy=False,
+        )
 
         # Sadece test verileri üzerinde kar-zarar hesaplaması yapın
-        test_df = self.df[self.df.index >= self.start_date]
+        i0 = self._test_start_iloc
+        test_df = self.df.iloc[i0:]
 
-        test_df['PortfolioReturn'] = sum(test_df[f'{stock}_AlgoReturn'] * weight for stock, weight in self.portfolio.items())
+        # Portföy getirisi tek gemv ile: S ayrı Series çarpımı yerine
+        weights = np.fromiter(self.portfolio.values(), dtype=np.float64)
+        test_df['PortfolioReturn'] = algo[i0:] @ weights
         total_return = (1 + test_df['PortfolioReturn']).prod() - 1
 
         result = {
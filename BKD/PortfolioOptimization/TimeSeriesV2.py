@@ -1,12 +1,60 @@
+import time
+
 import pandas as pd
 import numpy as np
-import yfinance as yf
+from DataCache import download_close
 from datetime import datetime, timedelta
+from joblib import Parallel, delayed
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import SVC
 from sklearn.preprocessing import StandardScaler
 
+
+# Aynı (portföy, tarih, model, train_days) kombinasyonu için fit sonuçları
+# 24 saat bellekte tutulur: tekrar eden isteklerde fit tamamen atlanır.
+# Anahtar veri penceresinin çözülmüş bitiş tarihini de içerir; yeni bir
+# işlem günü pencereyi büyüttüğünde eski sonuçlar kullanılmaz.
+_FIT_CACHE_TTL = 24 * 3600
+_fit_cache = {}
+
+
+def _fit_cache_get(key):
+    hit = _fit_cache.get(key)
+    if hit is None:
+        return None
+    ts, results = hit
+    if time.time() - ts > _FIT_CACHE_TTL:
+        # pop: threaded sunucuda iki istek aynı süresi dolmuş anahtarı
+        # görebilir, ikinci del KeyError fırlatırdı
+        _fit_cache.pop(key, None)
+        return None
+    return results
+
+
+def _fit_one(stock, series, Ntest, T, model):
+    # joblib işçisinde çalışır: her hisse için scaler + fit + predict bağımsız
+    windows = np.lib.stride_tricks.sliding_window_view(series, T)
+    X = windows[:-1]
+    # Pozitif getiri: 1 (Al), Negatif getiri: 0 (Sat)
+    Y = (series[T:] > 0).astype(int)
+
+    X_train, Y_train = X[:-Ntest], Y[:-Ntest]
+    X_test = X[-Ntest:]
+
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X_train)
+    X_test = scaler.transform(X_test)
+
+    # Model eğitimi ve tahmin
+    model.fit(X_train, Y_train)
+    predictions = model.predict(X_test)
+
+    # Train kümesinin son elemanının sinyalini doğrudan hesapla
+    train_last_signal = 1 if series[len(series) - Ntest - 1] > 0 else 0
+    return stock, len(X_train), predictions, train_last_signal
+
 class TimeSeriesStrategy:
     def __init__(self, portfolio, start_date, model, train_days):
         self.portfolio = portfolio
@@ -27,11 +75,10 @@ class TimeSeriesStrategy:
 
     def create_dataset(self, stocks, start, end):
         try:
-            stock_data = yf.download(stocks, start=start, end=end)['Close']
-            if stock_data.isna().sum().sum() > 0:
-                print("Eksik veri tespit edildi. Eksik veriler dolduruluyor...")
-                stock_data.fillna(method='ffill', inplace=True)
-                stock_data.dropna(axis=1, inplace=True)
+            stock_data = download_close(stocks, start, end)
+            # ffill NaN yokken no-op olduğundan ön kontrol gereksiz;
+            # fillna(method=...) pandas 2.x'te deprecated
+            stock_data = stock_data.ffill().dropna(axis=1)
             return stock_data
         except Exception as e:
             print(f"Veri çekme sırasında hata oluştu: {e}")
@@ -43,6 +90,9 @@ class TimeSeriesStrategy:
         end = (start_date_dt + pd.DateOffset(months=1)).strftime('%Y-%m-%d')
         today = datetime.today().date()
         end = end if datetime.strptime(end, '%Y-%m-%d').date() <= today else today.strftime('%Y-%m-%d')
+        # Fit cache anahtarı için saklanır: bugüne kırpılan end her yeni
+        # işlem gününde değişir ve Ntest'i büyütür
+        self._data_end = end
 
         self.df = self.create_dataset(list(self.portfolio.keys()), start, end)
 
@@ -50,78 +100,122 @@ class TimeSeriesStrategy:
             print("Veri çekilemedi. Lütfen tarihleri ve sembolleri kontrol edin.")
             return
 
-        for stock in self.portfolio.keys():
-            self.df[f'{stock}_LogPrice'] = np.log(self.df[stock])
-            self.df[f'{stock}_Return'] = self.df[f'{stock}_LogPrice'].diff()
+        # Log fiyat ve getiri tüm hisseler için tek matris üzerinde
+        # hesaplanır ve tek concat ile eklenir
+        stocks = list(self.portfolio.keys())
+        closes = self.df[stocks].to_numpy(dtype=np.float64)
+        log_prices = np.log(closes)
+        returns = np.empty_like(log_prices)
+        returns[0] = np.nan
+        returns[1:] = log_prices[1:] - log_prices[:-1]
+
+        self.df = pd.concat(
+            [
+                self.df,
+                pd.DataFrame(log_prices, index=self.df.index, columns=[f'{s}_LogPrice' for s in stocks]),
+                pd.DataFrame(returns, index=self.df.index, columns=[f'{s}_Return' for s in stocks]),
+            ],
+            axis=1,
+            copy=False,
+        )
+
+        # Test aralığının başlangıcı bir kez searchsorted ile bulunur;
+        # sonraki bütün dilimlemeler bool maske yerine bu pivotu kullanır
+        self._test_start_iloc = self.df.index.searchsorted(pd.Timestamp(self.start_date))
 
     def generate_signals(self):
-        Ntest = len(self.df[self.df.index >= self.start_date])
-
-        for stock in self.portfolio.keys():
-            series = self.df[f'{stock}_Return'].to_numpy()[1:]
-
-            # X ve Y oluşturulması
-            X = []
-            Y = []
-
-            for t in range(len(series) - self.T):
-                X.append(series[t:t + self.T])
-                # Pozitif getiri: 1 (Al), Negatif getiri: 0 (Sat)
-                Y.append(1 if series[t + self.T] > 0 else 0)
-
-            X = np.array(X).reshape(-1, self.T)
-            Y = np.array(Y)
-
-            X_train, Y_train = X[:-Ntest], Y[:-Ntest]
-            X_test = X[-Ntest:]
-
-            scaler = StandardScaler()
-            X_train = scaler.fit_transform(X_train)
-            X_test = scaler.transform(X_test)
-
-            # Model eğitimi ve tahmin
-            self.model.fit(X_train, Y_train)
-            predictions = self.model.predict(X_test)
-
-            # Sinyal oluşturulması
-            # Train kümesinin son elemanının sinyalini doğrudan hesapla
-            train_last_signal = 1 if series[len(series) - Ntest - 1] > 0 else 0
-            self.df.loc[self.df.index[len(X_train) - 1], f'{stock}_Signal'] = train_last_signal
-            self.df.loc[self.df.index[-Ntest:], f'{stock}_Signal'] = predictions
-            self.df[f'{stock}_PrevSignal'] = self.df[f'{stock}_Signal'].shift(1)
-            self.df[f'{stock}_Buy'] = (self.df[f'{stock}_PrevSignal'] == 0) & (self.df[f'{stock}_Signal'] == 1)
-            self.df[f'{stock}_Sell'] = (self.df[f'{stock}_PrevSignal'] == 1) & (self.df[f'{stock}_Signal'] == 0)
+        Ntest = len(self.df) - self._test_start_iloc
+        stocks = list(self.portfolio.keys())
+
+        cache_key = (
+            tuple(sorted(self.portfolio.items())),
+            self.start_date,
+            self._data_end,
+            len(self.df),
+            type(self.model).__name__,
+            self.train_days,
+            self.T,
+        )
+        results = _fit_cache_get(cache_key)
+        if results is None:
+            # Hisseler birbirinden bağımsız: fit/predict joblib ile paralel
+            # koşulur; tek model örneği paylaşılmasın diye her göreve clone verilir
+            results = Parallel(n_jobs=-1)(
+                delayed(_fit_one)(
+                    stock,
+                    self.df[f'{stock}_Return'].to_numpy()[1:],
+                    Ntest,
+                    self.T,
+                    clone(self.model),
+                )
+                for stock in stocks
+            )
+            _fit_cache[cache_key] = (time.time(), results)
+
+        # Sinyal sütunları paralel bloktan sonra tek seferde kurulur
+        signal_mat = np.full((len(self.df), len(stocks)), np.nan)
+        for j, (stock, n_train, predictions, train_last_signal) in enumerate(results):
+            signal_mat[n_train - 1, j] = train_last_signal
+            signal_mat[-Ntest:, j] = predictions
+
+        prev = np.vstack([np.full((1, len(stocks)), np.nan), signal_mat[:-1]])
+        buy = (prev == 0) & (signal_mat == 1)
+        sell = (prev == 1) & (signal_mat == 0)
+
+        self.df = pd.concat(
+            [
+                self.df,
+                pd.DataFrame(signal_mat, index=self.df.index, columns=[f'{s}_Signal' for s in stocks]),
+                pd.DataFrame(prev, index=self.df.index, columns=[f'{s}_PrevSignal' for s in stocks]),
+                pd.DataFrame(buy, index=self.df.index, columns=[f'{s}_Buy' for s in stocks]),
+                pd.DataFrame(sell, index=self.df.index, columns=[f'{s}_Sell' for s in stocks]),
+            ],
+            axis=1,
+            copy=False,
+        )
 
     def backtest(self):
         self.prepare_data()
         self.generate_signals()
 
-        is_invested = {stock: False for stock in self.portfolio. keys()}
-        new_columns = {}
-
-        def assign_is_invested(row, stock):
-            if is_invested[stock]:
-                if row[f'{stock}_Sell']:
-                    is_invested[stock] = False
-            else:
-                if row[f'{stock}_Buy']:
-                    is_invested[stock] = True
-            return is_invested[stock]
-
-        for stock in self.portfolio.keys():
-            new_columns[f'{stock}_IsInvested'] = self.df.apply(lambda row: assign_is_invested(row, stock), axis=1)
-            new_columns[f'{stock}_AlgoReturn'] = new_columns[f'{stock}_IsInvested'] * self.df[f'{stock}_Return']
-
-        # Tüm yeni sütunları bir DataFrame olarak birleştirin
-        new_columns_df = pd.DataFrame(new_columns, index=self.df.index)
+        stocks = list(self.portfolio.keys())
+
+        # Yatırım durumu ve algoritma getirisi tüm hisseler için tek matris
+        # üzerinde: sütun başına pandas hash lookup'ı yok, Buy 1 / Sell 0
+        # yazılıp aradaki günler tek DataFrame ffill ile taşınır
+        buy_mat = self.df[[f'{s}_Buy' for s in stocks]].to_numpy(dtype=bool)
+        sell_mat = self.df[[f'{s}_Sell' for s in stocks]].to_numpy(dtype=bool)
+        ret_mat = self.df[[f'{s}_Return' for s in stocks]].to_numpy(dtype=np.float64)
+
+        state = np.full(ret_mat.shape, np.nan)
+        state[buy_mat] = 1.0
+        state[sell_mat] = 0.0
+        invested = (
+            pd.DataFrame(state, index=self.df.index)
+            .ffill()
+            .fillna(0.0)
+            .to_numpy(dtype=bool)
+        )
+        algo = invested * ret_mat
 
         # Orijinal DataFrame ile yeni sütunları tek seferde birleştirin
-        self.df = pd.concat([self.df, new_columns_df], axis=1)
+        self.df = pd.concat(
+            [
+                self.df,
+                pd.DataFrame(invested, index=self.df.index, columns=[f'{s}_IsInvested' for s in stocks]),
+                pd.DataFrame(algo, index=self.df.index, columns=[f'{s}_AlgoReturn' for s in stocks]),
+            ],
+            axis=1,
+            copy=False,
+        )
 
         # Sadece test verileri üzerinde kar-zarar hesaplaması yapın
-        test_df = self.df[self.df.index >= self.start_date]
+        i0 = self._test_start_iloc
+        test_df = self.df.iloc[i0:]
 
-        test_df['PortfolioReturn'] = sum(test_df[f'{stock}_AlgoReturn'] * weight for stock, weight in self.portfolio.items())
+        # Portföy getirisi tek gemv ile: S ayrı Series çarpımı yerine
+        weights = np.fromiter(self.portfolio.values(), dtype=np.float64)
+        test_df['PortfolioReturn'] = algo[i0:] @ weights
         total_return = (1 + test_df['PortfolioReturn']).prod() - 1
 
         result = {
@@ -21,6 +21,7 @@ def train_portfolio():
         train_days = data['train_days']
         opt_type = data['opt_type']
         number_of_stock = data.get('numberOfStock', 10)
+        cov_method = data.get('cov_method', 'sample') # sample, ledoit_wolf, oas
 
         portfolio = Portfolio(stock_market=stock_market)
 
@@ -30,9 +31,9 @@ def train_portfolio():
             P = data.get('P', 100)
             MR = data.get('MR', 0.1)
             fitnessFun = data.get('fun', 'dengeli')
-            weights = portfolio.trainPortfolio(date=date, train_days=train_days, opt_type=opt_type, numberOfStock=number_of_stock, evaNum=evaNum, limit=limit, P=P, MR=MR, fitnessFun=fitnessFun)
+            weights = portfolio.trainPortfolio(date=date, train_days=train_days, opt_type=opt_type, numberOfStock=number_of_stock, evaNum=evaNum, limit=limit, P=P, MR=MR, fitnessFun=fitnessFun, cov_method=cov_method)
         else:
-            weights = portfolio.trainPortfolio(date=date, train_days=train_days, opt_type=opt_type, numberOfStock=number_of_stock)
+            weights = portfolio.trainPortfolio(date=date, train_days=train_days, opt_type=opt_type, numberOfStock=number_of_stock, cov_method=cov_method)
         return jsonify(weights)
 
     except Exception as e:
@@ -104,7 +105,11 @@ def timeSeries():
         return jsonify({"status": "error", "message": str(e)})
 
 if __name__ == '__main__':
-    app.run(port=5050, debug=True)
+    # Geliştirme amaçlı çalıştırma; prod'da Procfile'daki gunicorn kullanılır:
+    #   gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5050 app:app
+    # debug=True Werkzeug reloader'ı ile her isteğe gecikme ekliyordu,
+    # threaded=True yfinance/SLSQP işlerinin istekleri serileştirmesini önler.
+    app.run(port=5050, debug=False, threaded=True)
 
 
 